@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Article prefetch: fetch every candidate's article, extract the readable text,
+and keep it in an on-disk cache so the curator reads local files instead of
+hitting WebFetch / r.jina.ai for each selected story.
+
+Cache layout (.cache/articles/):
+    index.json            url -> {hash, final_url, truncated, etag, last_modified, fetched, ...}
+    objects/ab/abcd.json  extract for one response body, keyed by its sha256
+
+Entries younger than --ttl are served without touching the network. Older
+ones are revalidated with If-None-Match / If-Modified-Since; a 304, or a
+200 with the same body hash, reuses the stored extract. Identical bodies
+under different URLs share one object, so it holds only what the body
+says; the final URL and truncation live in each URL's index entry. When the objects outgrow
+--max-cache-mb, the least recently read entries are evicted first.
+
+Extraction runs in a process pool so parsing overlaps the downloads.
+
+Usage:
+    ./articles.py --stories /tmp/hn/stories.json -o /tmp/hn/articles
+    ./articles.py https://example.com/post -o /tmp/articles
+    ./articles.py --stories /tmp/hn/stories.json --ttl 0   # revalidate everything
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from time import perf_counter, time
+
+from asynchttp import HTTPError, Pool
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+CACHE_DIR = REPO_ROOT / ".cache" / "articles"
+
+EXTRACT_VERSION = 1
+MAX_TEXT = 20_000
+MAX_BODY = 3_000_000
+
+SKIP_TAGS = {"title", "script", "style", "noscript", "template", "svg", "math", "iframe", "canvas",
+             "nav", "header", "footer", "aside", "form", "button", "select", "textarea", "dialog"}
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote",
+              "dd", "dt", "td", "th", "figcaption", "div", "section", "article", "main",
+              "br", "hr", "tr", "ul", "ol", "table", "body"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+NOISE_RE = re.compile(r"comment|share|social|related|promo|sidebar|footer|header|menu|nav|"
+                      r"cookie|banner|subscribe|newsletter|advert|sponsor|popup|modal", re.I)
+SPACE_RE = re.compile(r"\s+")
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.I)
+
+
+class _Node:
+    __slots__ = ("tag", "parent", "score", "noise", "hidden")
+
+    def __init__(self, tag, parent, noise=False, hidden=False):
+        self.tag = tag
+        self.parent = parent
+        self.score = 0.0
+        self.noise = noise or (parent is not None and parent.noise)
+        self.hidden = hidden
+
+
+class _Readable(HTMLParser):
+    """Collect text blocks with their enclosing element, readability-style."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#root", None)
+        self.nodes = [self.root]
+        self.stack = [self.root]
+        self.skip = 0
+        self.title = ""
+        self.og_title = ""
+        self.in_title = False
+        self.blocks = []          # (node, tag, text, link_chars)
+        self.buf, self.links, self.in_link = [], 0, 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            a = dict(attrs)
+            if a.get("property") == "og:title" and a.get("content"):
+                self.og_title = a["content"]
+            return
+        if tag in VOID_TAGS:
+            if tag in ("br", "hr") and not self.skip:
+                self.buf.append("\n")
+            return
+        if tag == "title":
+            self.in_title = True
+        if self.skip or tag in SKIP_TAGS:
+            self.skip += 1
+            self.stack.append(_Node(tag, self.stack[-1], hidden=True))
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        a = dict(attrs)
+        noise = bool(NOISE_RE.search(f"{a.get('class') or ''} {a.get('id') or ''}")) \
+            and tag not in ("article", "main", "body")
+        node = _Node(tag, self.stack[-1], noise)
+        self.nodes.append(node)
+        self.stack.append(node)
+        if tag == "a":
+            self.in_link += 1
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self.in_title = False
+        # tolerate sloppy HTML: close up to the nearest matching open tag
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                break
+        else:
+            return
+        if tag in BLOCK_TAGS and not self.skip:
+            self._flush()
+        for node in self.stack[i:]:
+            if node.hidden:
+                self.skip -= 1
+            elif node.tag == "a" and self.in_link:
+                self.in_link -= 1
+        del self.stack[i:]
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title += data
+        if self.skip:
+            return
+        self.buf.append(data)
+        if self.in_link:
+            self.links += len(data.strip())
+
+    def _flush(self):
+        text = SPACE_RE.sub(" ", "".join(self.buf)).strip()
+        if text:
+            node = self.stack[-1]
+            self.blocks.append((node, node.tag, text, self.links))
+        self.buf, self.links = [], 0
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract(body: bytes, content_type: str = "") -> dict:
+    """Readable main text of one response body: {title, text, words, kind}."""
+    ctype = content_type.split(";")[0].strip().lower()
+    if ctype and ctype not in ("text/html", "application/xhtml+xml") and not ctype.startswith("text/"):
+        return {"title": "", "text": "", "words": 0, "kind": ctype}
+    charset = None
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = value.strip("\"'")
+    if charset is None:
+        m = META_CHARSET_RE.search(body[:4096])
+        charset = m.group(1).decode("ascii") if m else "utf-8"
+    try:
+        html = body.decode(charset, errors="replace")
+    except LookupError:
+        html = body.decode("utf-8", errors="replace")
+
+    if ctype == "text/plain" or (not ctype and "<" not in html[:1024]):
+        text = html.strip()[:MAX_TEXT]
+        return {"title": "", "text": text, "words": len(text.split()), "kind": "text"}
+
+    parser = _Readable()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:   # HTMLParser can still trip over truly broken markup
+        parser._flush()
+
+    # score containers by the paragraphs they hold, discounting link lists
+    for node, tag, text, links in parser.blocks:
+        if len(text) < 25 or node.noise:
+            continue
+        score = (1 + text.count(",") + min(len(text) / 100, 3)) * (1 - links / len(text))
+        if node.tag in ("p", "pre", "blockquote", "li", "td"):
+            node = node.parent or node
+        node.score += score
+        if node.parent is not None:
+            node.parent.score += score / 2
+    best = max(parser.nodes, key=lambda n: n.score)
+    if best.score < 3:
+        best = parser.root
+
+    lines = []
+    for node, tag, text, links in parser.blocks:
+        n = node
+        while n is not None and n is not best:
+            n = n.parent
+        if n is None or (node.noise and not best.noise):
+            continue
+        if links > 0.5 * len(text) and len(text) < 200:
+            continue
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            text = "#" * int(tag[1]) + " " + text
+        elif tag == "li":
+            text = "- " + text
+        lines.append(text)
+    text = "\n\n".join(lines)[:MAX_TEXT]
+    title = SPACE_RE.sub(" ", parser.og_title or parser.title).strip()
+    return {"title": title, "text": text, "words": len(text.split()), "kind": "html"}
+
+
+class ArticleCache:
+    """URL index + content-addressed extracts, with TTL and LRU eviction."""
+
+    def __init__(self, root: Path = CACHE_DIR, ttl: float = 24 * 3600, max_bytes: int = 64 << 20):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index = {}
+        self.stats = {"fresh": 0, "revalidated": 0, "reused": 0, "fetched": 0, "stale": 0, "failed": 0}
+        try:
+            data = json.loads((root / "index.json").read_text(encoding="utf-8"))
+            if data.get("version") == EXTRACT_VERSION:
+                self.index = data.get("urls", {})
+        except (OSError, ValueError):
+            pass
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str):
+        """(entry, extract) for a cached url, or (None, None)."""
+        entry = self.index.get(url)
+        if entry:
+            try:
+                return entry, json.loads(self.object_path(entry["hash"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                del self.index[url]
+        return None, None
+
+    def load_object(self, digest: str):
+        try:
+            return json.loads(self.object_path(digest).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put_object(self, digest: str, doc: dict) -> int:
+        path = self.object_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(doc, ensure_ascii=False).encode()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return len(data)
+
+    def fresh(self, entry: dict) -> bool:
+        return time() - entry["fetched"] < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, url: str, **updates):
+        entry = self.index[url]
+        entry.update(updates)
+        entry["accessed"] = time()
+
+    def record(self, url: str, digest: str, size: int, resp):
+        now = time()
+        self.index[url] = {"hash": digest, "size": size, "status": resp.status,
+                           "final_url": resp.url, "truncated": resp.truncated,
+                           "etag": resp.headers.get("etag", ""),
+                           "last_modified": resp.headers.get("last-modified", ""),
+                           "fetched": now, "accessed": now}
+
+    def save(self):
+        """Evict least recently read entries over the size cap, drop orphan objects."""
+        sizes = {}
+        for entry in sorted(self.index.values(), key=lambda e: e["accessed"], reverse=True):
+            sizes.setdefault(entry["hash"], entry["size"])
+        total = sum(sizes.values())
+        if total > self.max_bytes:
+            for url, entry in sorted(self.index.items(), key=lambda kv: kv[1]["accessed"]):
+                if total <= self.max_bytes:
+                    break
+                del self.index[url]
+                if all(e["hash"] != entry["hash"] for e in self.index.values()):
+                    total -= sizes.pop(entry["hash"], 0)
+        live = {e["hash"] for e in self.index.values()}
+        for path in (self.root / "objects").glob("*/*.json"):
+            if path.stem not in live:
+                path.unlink(missing_ok=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "index.json.tmp"
+        tmp.write_text(json.dumps({"version": EXTRACT_VERSION, "urls": self.index},
+                                  ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.root / "index.json")
+
+
+def for_url(doc: dict, entry: dict, url: str) -> dict:
+    """The shared extract plus what belongs to this one url's response."""
+    return {**doc, "url": entry.get("final_url") or url, "truncated": entry.get("truncated", False)}
+
+
+async def fetch_article(pool: Pool, cache: ArticleCache, url: str, timeout: float,
+                        executor=None) -> dict | None:
+    """Extract for one url, from cache when possible. None if unreachable.
+
+    Best effort: articles are untrusted third-party pages, so whatever goes
+    wrong with one of them is a warning and a None, never an exception that
+    takes the other fetches down with it.
+    """
+    try:
+        return await _fetch_article(pool, cache, url, timeout, executor)
+    except Exception as e:
+        print(f"  warn: article {url}: {type(e).__name__}: {e}", file=sys.stderr)
+        cache.stats["failed"] += 1
+        return None
+
+
+async def _fetch_article(pool: Pool, cache: ArticleCache, url: str, timeout: float, executor) -> dict | None:
+    entry, doc = cache.get(url)
+    if entry and cache.fresh(entry):
+        cache.touch(url)
+        cache.stats["fresh"] += 1
+        return for_url(doc, entry, url)
+
+    headers = cache.conditional_headers(entry) if entry else {}
+    try:
+        resp = await pool.get(url, headers=headers, timeout=timeout, retries=0, max_bytes=MAX_BODY)
+    except HTTPError as e:
+        if entry:
+            cache.touch(url)
+            cache.stats["stale"] += 1
+            return for_url(doc, entry, url)
+        print(f"  warn: article {url}: {e}", file=sys.stderr)
+        cache.stats["failed"] += 1
+        return None
+
+    if resp.status == 304 and entry:
+        cache.touch(url, fetched=time())
+        cache.stats["revalidated"] += 1
+        return for_url(doc, entry, url)
+    if not resp.ok:
+        cache.stats["failed"] += 1
+        if entry:
+            cache.touch(url)
+            return for_url(doc, entry, url)
+        print(f"  warn: article {url}: HTTP {resp.status}", file=sys.stderr)
+        return None
+
+    digest = hashlib.sha256(resp.body).hexdigest()
+    doc = cache.load_object(digest)
+    if doc is not None:
+        cache.stats["reused"] += 1
+        size = cache.object_path(digest).stat().st_size
+    else:
+        ctype = resp.headers.get("content-type", "")
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            doc = await loop.run_in_executor(executor, extract, resp.body, ctype)
+        else:
+            doc = extract(resp.body, ctype)
+        size = cache.put_object(digest, doc)
+        cache.stats["fetched"] += 1
+    cache.record(url, digest, size, resp)
+    return for_url(doc, cache.index[url], url)
+
+
+async def prefetch(pool: Pool, cache: ArticleCache, urls: list, timeout: float = 8.0,
+                   workers: int = None) -> list:
+    """Extracts for many urls at once (None where unreachable), in input order."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = None
+    if workers > 1 and urls:
+        # by now the event loop has resolver threads; don't fork() under them
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    try:
+        return await asyncio.gather(*(fetch_article(pool, cache, u, timeout, executor) for u in urls))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def write_extract(path: Path, doc: dict, url: str):
+    head = [f"Title: {doc.get('title') or ''}", f"URL: {doc.get('url') or url}",
+            f"Words: {doc.get('words', 0)}" + (" (truncated)" if doc.get("truncated") else "")]
+    if doc.get("kind") not in ("html", "text"):
+        head.append(f"Content-Type: {doc.get('kind')} (not extracted)")
+    path.write_text("\n".join(head) + "\n\n" + doc.get("text", "") + "\n", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch and extract articles into a local cache")
+    parser.add_argument("urls", nargs="*", help="article URLs")
+    parser.add_argument("--stories", type=Path, help="stories.json written by hn-fetch.py")
+    parser.add_argument("-o", "--out", type=Path, help="write one extract per article here")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="cache dir (default: .cache/articles)")
+    parser.add_argument("--ttl", type=float, default=24.0, help="hours before revalidating (default: 24)")
+    parser.add_argument("--max-cache-mb", type=float, default=64.0, help="LRU size cap (default: 64)")
+    parser.add_argument("-j", "--concurrency", type=int, default=16, help="max fetches in flight (default: 16)")
+    parser.add_argument("--timeout", type=float, default=8.0, help="per-article timeout (default: 8)")
+    args = parser.parse_args()
+
+    targets = [(u, u) for u in args.urls]
+    if args.stories:
+        data = json.loads(args.stories.read_text(encoding="utf-8"))
+        targets += [(s["id"], s["url"]) for s in data["stories"] if "news.ycombinator.com" not in s["url"]]
+    if not targets:
+        parser.error("give article URLs or --stories")
+
+    cache = ArticleCache(args.cache_dir, args.ttl * 3600, int(args.max_cache_mb * (1 << 20)))
+
+    async def run():
+        async with Pool(limit=args.concurrency, per_host=4, timeout=args.timeout, retries=0) as pool:
+            return await prefetch(pool, cache, [u for _, u in targets], args.timeout)
+
+    t = perf_counter()
+    docs = asyncio.run(run())
+    cache.save()
+
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+    for (key, url), doc in zip(targets, docs):
+        if doc is None:
+            print(f"  -    {url}")
+            continue
+        print(f"  {doc['words']:>5}w {url}  {doc.get('title', '')[:60]}")
+        if args.out:
+            name = key if isinstance(key, int) else hashlib.sha1(url.encode()).hexdigest()[:12]
+            write_extract(args.out / f"{name}.txt", doc, url)
+    s = cache.stats
+    print(f"{len(targets)} articles in {perf_counter() - t:.2f}s: {s['fresh']} fresh, "
+          f"{s['revalidated']} revalidated, {s['reused']} reused, {s['fetched']} fetched, "
+          f"{s['stale']} stale, {s['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
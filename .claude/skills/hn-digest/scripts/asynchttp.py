@@ -0,0 +1,361 @@
+"""
+Tiny asyncio HTTP/1.1 client with keep-alive connection pooling.
+
+Stdlib only, because the workflow runner has python3 but nothing installed.
+Good enough for the HN Firebase API, article pages and webhook POSTs:
+
+    async with Pool(limit=32, timeout=10) as pool:
+        resp = await pool.get("https://hacker-news.firebaseio.com/v0/item/1.json")
+        item = resp.json()
+
+- one global concurrency limit (semaphore) plus idle connections kept per host
+- per-request timeout covering connect + send + full body read
+- retries with exponential backoff on network errors, 5xx and 429
+  (Retry-After is honoured when the server sends it)
+- non-idempotent requests (POST, PATCH) are never resent once their bytes
+  went out: only connect failures, 429s and 5xx with Retry-After are
+  retried, and a timeout after the write raises HTTPError(maybe_sent=True)
+- redirects, chunked transfer encoding, gzip/deflate, optional body size cap
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import ssl
+import zlib
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from time import time
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "claude-reads-hn/1.0 (+https://github.com/thevibeworks/claude-reads-hn)"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+class HTTPError(Exception):
+    """Request failed for good: network error or timeout after the last retry,
+    or a response body that could not be decoded.
+
+    maybe_sent: the request went out but no complete response came back, so
+    the server may well have acted on it (only set for non-idempotent requests).
+    """
+
+    def __init__(self, message: str, status: int = 0, maybe_sent: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.maybe_sent = maybe_sent
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict
+    body: bytes
+    url: str
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self) -> str:
+        charset = "utf-8"
+        ctype = self.headers.get("content-type", "")
+        for part in ctype.split(";")[1:]:
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                charset = value.strip("\"'")
+        try:
+            return self.body.decode(charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class _Conn:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self):
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class Pool:
+    limit: int = 16           # max requests in flight across all hosts
+    per_host: int = 8         # max idle connections kept per host
+    timeout: float = 10.0     # seconds per attempt, connect to last body byte
+    retries: int = 2          # extra attempts after the first one
+    backoff: float = 0.5      # base delay, doubled per attempt, plus jitter
+    max_redirects: int = 5
+    user_agent: str = USER_AGENT
+    _idle: dict = field(default_factory=dict, init=False, repr=False)
+    _sem: asyncio.Semaphore = field(default=None, init=False, repr=False)
+    _ssl: ssl.SSLContext = field(default=None, init=False, repr=False)
+    stats: dict = field(default_factory=lambda: {"requests": 0, "connects": 0, "retries": 0}, init=False)
+
+    def __post_init__(self):
+        self._sem = asyncio.Semaphore(self.limit)
+        self._ssl = ssl.create_default_context()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+
+    async def get(self, url: str, **kw) -> Response:
+        return await self.request("GET", url, **kw)
+
+    async def post_json(self, url: str, payload, **kw) -> Response:
+        headers = {"Content-Type": "application/json", **kw.pop("headers", {})}
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        return await self.request("POST", url, headers=headers, body=body, **kw)
+
+    async def request(self, method: str, url: str, headers: dict = None, body: bytes = None,
+                      timeout: float = None, retries: int = None, max_bytes: int = None,
+                      follow_redirects: bool = True, retry_statuses=RETRY_STATUSES,
+                      idempotent: bool = None) -> Response:
+        """Send a request, following redirects and retrying transient failures.
+
+        Non-2xx responses are returned as-is unless their status is in
+        retry_statuses, in which case they are retried and the last one is
+        returned once attempts run out. Network errors and timeouts raise
+        HTTPError after the final attempt.
+
+        A non-idempotent request (default: anything but GET, HEAD, OPTIONS,
+        PUT, DELETE) is only retried when the server cannot have acted on it:
+        it failed before its bytes were written, or the server answered 429 or
+        a 5xx with Retry-After. Otherwise the error raises at once with
+        maybe_sent set, and a reused idle connection is not retried on a
+        fresh one.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            state = {"written": False}
+            try:
+                resp = await self._follow(method, url, headers or {}, body, timeout,
+                                          max_bytes, follow_redirects, idempotent, state)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                maybe_sent = state["written"] and not idempotent
+                if maybe_sent or attempt >= retries:
+                    raise HTTPError(f"{method} {url}: {type(e).__name__}: {e}",
+                                    maybe_sent=maybe_sent) from e
+                delay = self._delay(attempt)
+            else:
+                if resp.status not in retry_statuses or attempt >= retries:
+                    return resp
+                if not (idempotent or resp.status == 429 or "retry-after" in resp.headers):
+                    return resp
+                delay = max(self._delay(attempt), retry_after(resp.headers))
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def _delay(self, attempt: int) -> float:
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 4)
+
+    async def _follow(self, method, url, headers, body, timeout, max_bytes, follow_redirects, idempotent, state):
+        for _ in range(self.max_redirects + 1):
+            # only the hop in flight counts: a redirect means the server did not act
+            state["written"] = False
+            resp = await self._send(method, url, headers, body, timeout, max_bytes, idempotent, state)
+            location = resp.headers.get("location")
+            if not (follow_redirects and resp.status in REDIRECT_STATUSES and location):
+                return resp
+            url = urljoin(url, location)
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+        raise ValueError(f"too many redirects ({self.max_redirects})")
+
+    async def _send(self, method, url, headers, body, timeout, max_bytes, idempotent, state):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported url: {url}")
+        https = parts.scheme == "https"
+        port = parts.port or (443 if https else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}",
+                 f"User-Agent: {self.user_agent}", "Accept-Encoding: gzip, deflate",
+                 "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        async with self._sem:
+            self.stats["requests"] += 1
+            conn = self._checkout(key)
+            if conn is not None:
+                try:
+                    return await asyncio.wait_for(
+                        self._exchange(conn, key, request, method, url, max_bytes, state), timeout)
+                except asyncio.TimeoutError:
+                    # a TimeoutError is an OSError too, but the request's time is used up:
+                    # a slow server is not a stale socket, and request() decides about retries
+                    conn.close()
+                    raise
+                except (OSError, asyncio.IncompleteReadError):
+                    conn.close()
+                    if not idempotent:
+                        # it may have reached the server before the socket died: never resend
+                        raise
+                    # server dropped the idle keep-alive socket; retry on a fresh one
+                    state["written"] = False
+            return await asyncio.wait_for(
+                self._connect_and_exchange(key, https, request, method, url, max_bytes, state), timeout)
+
+    async def _connect_and_exchange(self, key, https, request, method, url, max_bytes, state):
+        _, hostname, port = key
+        reader, writer = await asyncio.open_connection(
+            hostname, port, ssl=self._ssl if https else None,
+            server_hostname=hostname if https else None, limit=2 ** 20)
+        self.stats["connects"] += 1
+        return await self._exchange(_Conn(reader, writer), key, request, method, url, max_bytes, state)
+
+    def _checkout(self, key):
+        conns = self._idle.get(key)
+        while conns:
+            conn = conns.pop()
+            if not conn.writer.is_closing() and not conn.reader.at_eof():
+                return conn
+            conn.close()
+        return None
+
+    def _checkin(self, key, conn):
+        conns = self._idle.setdefault(key, [])
+        if len(conns) < self.per_host:
+            conns.append(conn)
+        else:
+            conn.close()
+
+    async def _exchange(self, conn, key, request, method, url, max_bytes, state):
+        done = False
+        try:
+            state["written"] = True
+            conn.writer.write(request)
+            await conn.writer.drain()
+            resp, reusable = await _read_response(conn.reader, method, url, max_bytes)
+            if reusable:
+                self._checkin(key, conn)
+            else:
+                conn.close()
+            done = True
+            return resp
+        finally:
+            if not done:
+                conn.close()
+
+
+async def _read_response(reader, method, url, max_bytes):
+    status_line = await reader.readline()
+    if not status_line:
+        raise asyncio.IncompleteReadError(b"", None)
+    parts = status_line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ValueError(f"bad status line: {status_line[:80]!r}")
+    status = int(parts[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if 100 <= status < 200:
+        return await _read_response(reader, method, url, max_bytes)
+
+    reusable = headers.get("connection", "").lower() != "close"
+    truncated = False
+    if method == "HEAD" or status in (204, 304):
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks, size = [], 0
+        while True:
+            size_line = await reader.readline()
+            n = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if n == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(n))
+            await reader.readexactly(2)
+            size += n
+            if max_bytes and size >= max_bytes:
+                truncated, reusable = True, False
+                break
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        n = int(headers["content-length"])
+        if max_bytes and n > max_bytes:
+            body, truncated, reusable = await reader.readexactly(max_bytes), True, False
+        else:
+            body = await reader.readexactly(n)
+    else:
+        body = await reader.read(max_bytes or -1)
+        truncated = bool(max_bytes) and not reader.at_eof()
+        reusable = False
+
+    encoding = headers.get("content-encoding", "").lower()
+    if encoding in ("gzip", "x-gzip", "deflate") and body:
+        try:
+            body = _decompress(body, encoding, truncated)
+        except (zlib.error, EOFError, OSError) as e:
+            # a broken body is the server's fault and won't improve on retry
+            raise HTTPError(f"{method} {url}: corrupt {encoding} body: {type(e).__name__}: {e}",
+                            status) from e
+    return Response(status, headers, body, url, truncated), reusable
+
+
+def _decompress(body: bytes, encoding: str, partial: bool) -> bytes:
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    if not partial:
+        return gzip.decompress(body)
+    # truncated gzip stream: inflate whatever made it through
+    d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        return d.decompress(body)
+    except zlib.error:
+        return b""
+
+
+def retry_after(headers: dict) -> float:
+    """Seconds to wait according to a Retry-After header (delta or HTTP date)."""
+    value = headers.get("retry-after", "").strip()
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return 0.0
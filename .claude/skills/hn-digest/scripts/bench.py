@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark the generator scripts against synthetic archives.
+
+For each size, a seeded archive in the real org format (synthetic.py, i18n
+subtrees included) is written once and kept under --work. Every generator
+script then runs against it as its own process, in three phases:
+
+    cold    empty caches: parse every digest, build everything
+    warm    nothing changed: the stat-only path a normal run starts with
+    append  one more digest: what a scheduled run actually pays for
+
+Each phase records wall time, CPU time and peak RSS (from wait4). Results
+are keyed "SIZE SCRIPT PHASE", so files from different commits line up;
+--baseline compares against an earlier file with timings.compare() and
+exits 1 when any phase got more than --threshold percent slower.
+
+Usage:
+    ./bench.py                                          # 1k archive, every script
+    ./bench.py --sizes 1000 10000 50000 -o bench.json
+    ./bench.py --sizes 10000 --scripts org2html trends
+    ./bench.py -o new.json --baseline bench-main.json --threshold 20
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+import synthetic
+import timings
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+WORK_DIR = Path("/tmp/hn-bench")
+
+RESULTS_VERSION = 1
+PHASES = ("cold", "warm", "append")
+
+# script -> argv for (digests dir, cache dir, output dir)
+SCRIPTS = {
+    "llms-gen": lambda d, c, o: ["llms-gen.py", "--digests", d, "--cache-dir", c / "corpus",
+                                 "-o", o / "llms.txt"],
+    "org2json": lambda d, c, o: ["org2json.py", "--index", "--digests", d, "--cache-dir", c / "corpus",
+                                 "--out-dir", o],
+    "historian": lambda d, c, o: ["historian.py", "--digests", d, "--cache-dir", c / "corpus", "update"],
+    "org2html": lambda d, c, o: ["org2html.py", f"{d}/*/*/*.org", "-o", o / "index.html", "-d", "7",
+                                 "-a", o / "archive.html", "--cache-dir", c / "org2html",
+                                 "--corpus-cache", c / "corpus"],
+    "search-index": lambda d, c, o: ["search-index.py", "--digests", d, "--cache-dir", c / "corpus",
+                                     "-o", o / "search"],
+    "trends": lambda d, c, o: ["trends.py", "--digests", d, "--corpus-cache", c / "corpus",
+                               "--cache-dir", c / "trends", "-o", o / "trends"],
+}
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True,
+                              capture_output=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class Archive:
+    """A synthetic archive of `count` digests plus one held back for the append phase."""
+
+    def __init__(self, work: Path, count: int, seed: int):
+        self.root = work / f"archive-{count}-s{seed}"
+        self.digests = self.root / "digests"
+        self.count, self.seed = count, seed
+        self.info = self._ensure()
+        self.extra = self.root / "extra.org"
+        self.target = self.root / self.info["extra"]
+
+    def _ensure(self) -> dict:
+        try:
+            return json.loads((self.root / "archive.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        shutil.rmtree(self.root, ignore_errors=True)
+        t = perf_counter()
+        print(f"generating {self.count:,} digests (seed {self.seed}) -> {self.root}", flush=True)
+        paths = synthetic.write_archive(self.digests, self.count + 1, self.seed)
+        paths[-1].replace(self.root / "extra.org")
+        info = {"digests": self.count, "seed": self.seed,
+                "bytes": sum(p.stat().st_size for p in paths[:-1]),
+                "extra": paths[-1].relative_to(self.root).as_posix(),
+                "generated": round(perf_counter() - t, 1)}
+        (self.root / "archive.json").write_text(json.dumps(info, indent=1) + "\n", encoding="utf-8")
+        return info
+
+    def hold_back(self):
+        if self.target.exists():
+            self.target.replace(self.extra)
+
+    def add_extra(self):
+        self.extra.replace(self.target)
+
+
+def measure(argv: list, log) -> dict:
+    """Run one script to completion: wall seconds, CPU seconds, peak RSS, exit code."""
+    env = {k: v for k, v in os.environ.items() if k != timings.ENV}
+    t = perf_counter()
+    proc = subprocess.Popen([sys.executable, str(SCRIPT_DIR / argv[0]), *map(str, argv[1:])],
+                            stdout=log, stderr=subprocess.STDOUT, env=env)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = perf_counter() - t
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = usage.ru_maxrss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+    return {"seconds": round(wall, 3), "cpu": round(usage.ru_utime + usage.ru_stime, 3),
+            "rss_mb": round(rss, 1), "exit": proc.returncode}
+
+
+def bench_script(archive: Archive, name: str, work: Path, repeat: int) -> dict:
+    """phase -> best of `repeat` measurements for one script on one archive."""
+    run_dir = work / f"run-{archive.count}-{name}"
+    best = {}
+    with open(work / f"run-{archive.count}-{name}.log", "w", encoding="utf-8") as log:
+        for _ in range(repeat):
+            shutil.rmtree(run_dir, ignore_errors=True)
+            cache, out = run_dir / "cache", run_dir / "out"
+            out.mkdir(parents=True)
+            argv = SCRIPTS[name](archive.digests, cache, out)
+            archive.hold_back()
+            try:
+                for phase in PHASES:
+                    if phase == "append":
+                        archive.add_extra()
+                    log.write(f"--- {phase}\n")
+                    log.flush()
+                    m = measure(argv, log)
+                    if m["exit"]:
+                        raise RuntimeError(f"{name} {phase} exited {m['exit']}, see {log.name}")
+                    if phase not in best or m["seconds"] < best[phase]["seconds"]:
+                        best[phase] = m
+            finally:
+                archive.hold_back()
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generator scripts on synthetic archives")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000], help="archive sizes in digests (default: 1000)")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(SCRIPTS), default=list(SCRIPTS),
+                        help="scripts to run (default: all)")
+    parser.add_argument("--seed", type=int, default=1, help="synthetic archive seed (default: 1)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per phase, best kept (default: 1)")
+    parser.add_argument("--work", type=Path, default=WORK_DIR,
+                        help=f"archives, caches and logs; archives are reused (default: {WORK_DIR})")
+    parser.add_argument("-o", "--output", type=Path, help="results file (default: WORK/bench.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=timings.THRESHOLD,
+                        help=f"allowed slowdown in percent (default: {timings.THRESHOLD:g})")
+    parser.add_argument("--min-delta", type=float, default=timings.MIN_DELTA,
+                        help=f"ignore slowdowns smaller than this many seconds (default: {timings.MIN_DELTA:g})")
+    args = parser.parse_args()
+    if args.baseline and not args.baseline.exists():
+        parser.error(f"--baseline: no such file: {args.baseline}")
+
+    args.work.mkdir(parents=True, exist_ok=True)
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": commit(),
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} cpus",
+        "seed": args.seed,
+        "archives": {},
+        "results": {},
+    }
+    for size in args.sizes:
+        archive = Archive(args.work, size, args.seed)
+        results["archives"][str(size)] = archive.info
+        print(f"\n{size:,} digests, {archive.info['bytes'] / 2 ** 20:,.0f} MiB of org")
+        print(f"  {'script':<13} {'phase':<7} {'wall':>9} {'cpu':>9} {'peak rss':>10}")
+        for name in args.scripts:
+            try:
+                phases = bench_script(archive, name, args.work, args.repeat)
+            except RuntimeError as e:
+                print(f"error: {e}", file=sys.stderr)
+                sys.exit(1)
+            for phase, m in phases.items():
+                del m["exit"]
+                results["results"][f"{size} {name} {phase}"] = m
+                print(f"  {name:<13} {phase:<7} {m['seconds']:8.2f}s {m['cpu']:8.2f}s {m['rss_mb']:7.0f} MiB",
+                      flush=True)
+
+    output = args.output or args.work / "bench.json"
+    output.write_text(json.dumps(results, indent=1) + "\n", encoding="utf-8")
+    print(f"\nresults: {output}")
+    if args.baseline:
+        base = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print(f"\nvs {args.baseline} ({base.get('commit') or 'unknown commit'}), "
+              f"threshold {args.threshold:g}%:")
+        if not timings.report(base, results, args.threshold, args.min_delta):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
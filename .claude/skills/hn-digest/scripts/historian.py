@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Story history index: which digests covered which HN story, and how hot it was.
+
+Reads id/points/comments/title per digest from the shared corpus cache
+(orgcorpus.py, .cache/corpus/; only files whose size/mtime/content changed
+are re-read), then answers FRESH / REVISIT / SKIP for candidate stories
+without anyone having to read llms.txt end to end.
+
+    FRESH   - never covered
+    REVISIT - covered, but comments at least doubled since the last digest
+    SKIP    - covered and nothing much changed
+
+Usage:
+    ./historian.py check 46843037:43:21 46840252:67:40   # ID[:POINTS[:COMMENTS]]
+    ./historian.py check --stories /tmp/hn/stories.json  # candidates from hn-fetch.py
+    ./historian.py show 46835454                         # every appearance
+    ./historian.py update                                # just refresh the index
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+from orgcorpus import CACHE_DIR, DIGESTS_DIR
+
+REVISIT_GROWTH = 2.0
+
+
+@dataclass
+class Appearance:
+    when: str       # "YYYY-MM-DD HH:MM" (UTC)
+    path: str
+    points: int
+    comments: int
+    title: str
+
+
+class History:
+    """Story appearances across all digests, from the shared corpus cache."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, digests_dir: Path = DIGESTS_DIR):
+        self.corpus = orgcorpus.Corpus(cache_dir)
+        self.digests_dir = digests_dir
+        self.digests = []
+        self._by_id = None
+
+    @property
+    def rescanned(self) -> int:
+        return self.corpus.rescanned
+
+    def update(self) -> bool:
+        """Re-read new/changed digests, drop deleted ones. True if anything changed."""
+        self.digests = self.corpus.update(orgcorpus.digest_files(self.digests_dir))
+        self._by_id = None
+        return self.corpus.changed
+
+    def save(self):
+        self.corpus.save()
+
+    @property
+    def by_id(self) -> dict:
+        """story id -> [Appearance], oldest first."""
+        if self._by_id is None:
+            by_id = {}
+            for path, head in self.corpus.heads(self.digests):
+                for sid, title, points, comments in head["stories"]:
+                    if sid.isdigit():
+                        by_id.setdefault(int(sid), []).append(
+                            Appearance(head["when"], path, points, comments, title))
+            for apps in by_id.values():
+                apps.sort(key=lambda a: (a.when, a.path))
+            self._by_id = by_id
+        return self._by_id
+
+    def appearances(self, story_id) -> list:
+        return self.by_id.get(int(story_id), [])
+
+    def covered_since(self, when: str) -> set:
+        """IDs that appeared in any digest at or after `when` ("YYYY-MM-DD[ HH:MM]")."""
+        return {sid for sid, apps in self.by_id.items() if apps[-1].when >= when}
+
+    def verdict(self, story_id, comments: int = None) -> tuple:
+        """(FRESH|REVISIT|SKIP, last Appearance or None) for one candidate."""
+        apps = self.appearances(story_id)
+        if not apps:
+            return "FRESH", None
+        last = apps[-1]
+        if comments is not None and comments >= REVISIT_GROWTH * max(last.comments, 1):
+            return "REVISIT", last
+        return "SKIP", last
+
+
+def load(cache_dir: Path = CACHE_DIR, digests_dir: Path = DIGESTS_DIR) -> History:
+    """Open the index and bring it up to date, saving only if something changed."""
+    history = History(cache_dir, digests_dir)
+    if history.update():
+        history.save()
+    return history
+
+
+def describe(verdict: str, last: Appearance, comments: int = None) -> str:
+    if last is None:
+        return verdict
+    seen = f"last seen {last.when} ({last.comments}c"
+    seen += f" -> {comments}c)" if comments is not None else ")"
+    return f"{verdict}, {seen}"
+
+
+def parse_candidate(arg: str) -> tuple:
+    parts = arg.split(":")
+    sid = int(parts[0])
+    comments = int(parts[2]) if len(parts) > 2 and parts[2] else None
+    return sid, comments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HN story history lookups")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="corpus cache dir")
+    parser.add_argument("--digests", type=Path, default=DIGESTS_DIR, help="digests dir")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("update", help="refresh the index from digests/")
+    check = sub.add_parser("check", help="FRESH/REVISIT/SKIP for candidate stories")
+    check.add_argument("candidates", nargs="*", help="ID[:POINTS[:COMMENTS]]")
+    check.add_argument("--stories", type=Path, help="stories.json written by hn-fetch.py")
+    check.add_argument("--json", action="store_true", help="machine-readable output")
+    show = sub.add_parser("show", help="every appearance of a story")
+    show.add_argument("ids", nargs="+", type=int)
+    args = parser.parse_args()
+
+    t = perf_counter()
+    history = load(args.cache_dir, args.digests)
+
+    if args.cmd == "update":
+        print(f"{args.cache_dir}: {len(history.digests)} digests, {len(history.by_id)} stories "
+              f"({history.rescanned} rescanned, {(perf_counter() - t) * 1000:.1f}ms)")
+    elif args.cmd == "show":
+        for sid in args.ids:
+            apps = history.appearances(sid)
+            print(f"{sid}: {len(apps)} appearance(s)")
+            for a in apps:
+                print(f"  {a.when}  {a.points}pts {a.comments}c  {a.path}  {a.title}")
+    else:
+        candidates = [parse_candidate(c) for c in args.candidates]
+        if args.stories:
+            data = json.loads(args.stories.read_text(encoding="utf-8"))
+            candidates += [(s["id"], s.get("comments_count")) for s in data["stories"]]
+        if not candidates:
+            parser.error("check: give candidate IDs or --stories")
+        results = []
+        for sid, comments in candidates:
+            verdict, last = history.verdict(sid, comments)
+            results.append({"id": sid, "verdict": verdict, "comments": comments,
+                            "last_seen": last.when if last else None,
+                            "last_comments": last.comments if last else None,
+                            "appearances": len(history.appearances(sid))})
+            if not args.json:
+                print(f"{sid} {describe(verdict, last, comments)}")
+        if args.json:
+            print(json.dumps(results, indent=2))
+        print(f"({len(candidates)} checked in {(perf_counter() - t) * 1000:.1f}ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
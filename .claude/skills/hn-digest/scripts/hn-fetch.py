@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Fetch HN top stories + top comments + article extracts for Claude to curate.
+
+Replaces the serial curl/jq loop in the workflow. Every request goes through
+one pooled keep-alive client (asynchttp.Pool) with a concurrency limit,
+per-request timeout and retry with backoff, so 100 stories x 10 comments
+costs about the same wall time as 20 x 3 used to.
+
+Each candidate is tagged FRESH / REVISIT / SKIP from the story history
+index (historian.py), so the curator doesn't have to scan llms.txt.
+
+Every candidate's article is fetched and reduced to its readable text
+(articles.py), through the on-disk article cache, so stories seen in an
+earlier run cost a cache lookup or a 304 instead of a download.
+
+Writes:
+    OUT/stories.md        - same layout the curator prompt has always read
+    OUT/stories.json      - same content, structured, plus phase timings
+    OUT/articles/ID.txt   - extracted article text per story
+
+Usage:
+    ./hn-fetch.py                                # 20 stories -> /tmp/hn
+    ./hn-fetch.py -n 100 --comments 10           # bigger pool
+    ./hn-fetch.py --api http://127.0.0.1:8000/v0 # local stub of the Firebase API
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+
+import articles
+import historian
+import timings
+from asynchttp import HTTPError, Pool
+
+HN_API = "https://hacker-news.firebaseio.com/v0"
+HN_ITEM_URL = "https://news.ycombinator.com/item?id="
+
+TAG_RE = re.compile(r"<[^>]*>")
+SPACE_RE = re.compile(r"[ \n]+")
+
+
+def strip_tags(text: str) -> str:
+    """Plain text of an HN comment: tags dropped, entities (&amp; &#x27; &quot;) decoded."""
+    return html.unescape(TAG_RE.sub("", text))
+
+
+class Phases:
+    """Wall-clock timer per fetch phase, printed as it goes."""
+
+    def __init__(self):
+        self.timings = {}
+
+    def record(self, name: str, started: float, detail: str = ""):
+        elapsed = perf_counter() - started
+        self.timings[name] = round(elapsed, 3)
+        print(f"timing: {name:<10} {elapsed:6.2f}s {detail}".rstrip())
+
+
+async def fetch_item(pool: Pool, api: str, item_id) -> dict | None:
+    try:
+        resp = await pool.get(f"{api}/item/{item_id}.json")
+        return resp.json() if resp.ok else None
+    except (HTTPError, ValueError) as e:
+        print(f"  warn: item {item_id}: {e}", file=sys.stderr)
+        return None
+
+
+def story_record(rank: int, item: dict) -> dict:
+    sid = item["id"]
+    hn_url = f"{HN_ITEM_URL}{sid}"
+    return {
+        "rank": rank,
+        "id": sid,
+        "title": item.get("title") or "untitled",
+        "url": item.get("url") or hn_url,
+        "hn_url": hn_url,
+        "score": item.get("score") or 0,
+        "comments_count": item.get("descendants") or 0,
+        "by": item.get("by") or "anon",
+        "text": item.get("text") or "",
+        "comments": [],
+        "article_preview": "",
+        "article_file": "",
+        "article_words": 0,
+        "history": "FRESH",
+    }
+
+
+def render_markdown(fetched_at: datetime, stories: list) -> str:
+    out = ["# Hacker News Top Stories", f"Fetched at: {fetched_at:%Y-%m-%d %H:%M} UTC", ""]
+    for s in stories:
+        out += ["", "---", f"## {s['rank']}. {s['title']}",
+                f"- Score: {s['score']} | Comments: {s['comments_count']} | By: {s['by']}",
+                f"- History: {s['history']}",
+                f"- HN: {s['hn_url']}",
+                f"- Article: {s['url']}"]
+        if s["article_file"]:
+            out.append(f"- Extract: {s['article_file']} ({s['article_words']} words)")
+        if s["text"]:
+            out += ["", "Post:", s["text"][:1500], ""]
+        if s["comments"]:
+            out += ["", "Top comments:"]
+            out += [f"> {c['by']}: {c['text']}" for c in s["comments"]]
+        if s["article_preview"]:
+            out += ["", "Article preview:", s["article_preview"]]
+    return "\n".join(out) + "\n"
+
+
+async def run(args) -> dict:
+    phases = Phases()
+    now = datetime.now(timezone.utc)
+    t = perf_counter()
+    history = historian.load(args.corpus_cache, args.digests)
+    # light dedup: only skip stories from today's and yesterday's digests
+    skip = history.covered_since(f"{now - timedelta(days=1):%Y-%m-%d}")
+    phases.record("history", t, f"{len(history.digests)} digests indexed")
+    print(f"recent (24h): {len(skip)} stories to skip")
+
+    async with Pool(limit=args.concurrency, per_host=args.concurrency,
+                    timeout=args.timeout, retries=args.retries) as pool:
+        t = perf_counter()
+        resp = await pool.get(f"{args.api}/topstories.json")
+        if not resp.ok:
+            raise HTTPError(f"topstories: HTTP {resp.status}", resp.status)
+        top = resp.json() or []
+        pool_size = args.pool or max(100, 2 * args.count)
+        ids = [i for i in top[:pool_size] if i not in skip][:args.count]
+        phases.record("topstories", t, f"{len(top)} ids, {len(ids)} kept")
+
+        t = perf_counter()
+        items = await asyncio.gather(*(fetch_item(pool, args.api, i) for i in ids))
+        stories = [story_record(rank, item)
+                   for rank, item in enumerate((i for i in items if i), start=1)]
+        for s in stories:
+            verdict, last = history.verdict(s["id"], s["comments_count"])
+            s["history"] = historian.describe(verdict, last, s["comments_count"])
+        phases.record("stories", t, f"{len(stories)}/{len(ids)} items")
+
+        async def comments_phase():
+            t = perf_counter()
+            wanted = [(s, kid) for s, item in zip(stories, filter(None, items))
+                      for kid in (item.get("kids") or [])[:args.comments]]
+            got = await asyncio.gather(*(fetch_item(pool, args.api, kid) for _, kid in wanted))
+            for (s, kid), c in zip(wanted, got):
+                text = strip_tags((c or {}).get("text") or "")[:400]
+                if text:
+                    s["comments"].append({"id": kid, "by": c.get("by") or "anon", "text": text})
+            phases.record("comments", t, f"{sum(len(s['comments']) for s in stories)}/{len(wanted)} items")
+
+        async def articles_phase():
+            t = perf_counter()
+            limit = len(stories) if args.articles is None else args.articles
+            targets = [s for s in stories[:limit] if "news.ycombinator.com" not in s["url"]]
+            try:
+                docs = await articles.prefetch(pool, cache, [s["url"] for s in targets], args.article_timeout)
+            except Exception as e:
+                # extracts are a bonus; Claude can still WebFetch every article itself
+                print(f"  warn: article prefetch failed: {type(e).__name__}: {e}", file=sys.stderr)
+                docs = [None] * len(targets)
+            out_dir = args.out / "articles"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for s, doc in zip(targets, docs):
+                if not doc or not doc["text"]:
+                    continue
+                path = out_dir / f"{s['id']}.txt"
+                articles.write_extract(path, doc, s["url"])
+                s["article_file"], s["article_words"] = str(path), doc["words"]
+                if s["rank"] <= args.previews:
+                    s["article_preview"] = SPACE_RE.sub(" ", doc["text"])[:2000]
+            c = cache.stats
+            phases.record("articles", t, f"{sum(1 for s in targets if s['article_file'])}/{len(targets)} "
+                          f"extracted ({c['fresh']} fresh, {c['revalidated']} revalidated, "
+                          f"{c['reused']} reused, {c['fetched']} fetched)")
+
+        cache = articles.ArticleCache(args.article_cache, args.article_ttl * 3600)
+        await asyncio.gather(comments_phase(), articles_phase())
+        cache.save()
+        print(f"http: {pool.stats['requests']} requests, {pool.stats['connects']} connections, "
+              f"{pool.stats['retries']} retries")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    (args.out / "stories.md").write_text(render_markdown(now, stories), encoding="utf-8")
+    result = {
+        "fetched_at": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "stories": stories,
+        "timings": phases.timings,
+    }
+    (args.out / "stories.json").write_text(
+        json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"pool for Claude: {len(stories)} stories -> {args.out}/stories.md")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch HN stories for curation")
+    parser.add_argument("-n", "--count", type=int, default=20, help="stories to fetch (default: 20)")
+    parser.add_argument("--pool", type=int, default=0,
+                        help="top stories to consider (default: 100, or 2x count if larger)")
+    parser.add_argument("--comments", type=int, default=3, help="top comments per story (default: 3)")
+    parser.add_argument("--articles", type=int, default=None,
+                        help="fetch and extract articles for first N stories (default: all)")
+    parser.add_argument("--previews", type=int, default=3,
+                        help="inline article previews in stories.md for first N stories (default: 3)")
+    parser.add_argument("-o", "--out", type=Path, default=Path("/tmp/hn"), help="output dir (default: /tmp/hn)")
+    parser.add_argument("--digests", type=Path, default=historian.DIGESTS_DIR,
+                        help="digests dir for dedup and history tags")
+    parser.add_argument("--corpus-cache", type=Path, default=historian.CACHE_DIR,
+                        help="parsed digest cache used for history tags")
+    parser.add_argument("--api", default=HN_API, help="HN Firebase API base URL")
+    parser.add_argument("-j", "--concurrency", type=int, default=32, help="max requests in flight (default: 32)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds (default: 10)")
+    parser.add_argument("--article-timeout", type=float, default=8.0, help="per-article timeout (default: 8)")
+    parser.add_argument("--article-cache", type=Path, default=articles.CACHE_DIR, help="article cache dir")
+    parser.add_argument("--article-ttl", type=float, default=24.0,
+                        help="hours before a cached article is revalidated (default: 24)")
+    parser.add_argument("--retries", type=int, default=3, help="retries per API request (default: 3)")
+    args = parser.parse_args()
+    args.api = args.api.rstrip("/")
+
+    t = perf_counter()
+    try:
+        asyncio.run(run(args))
+    except HTTPError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"timing: total      {perf_counter() - t:6.2f}s")
+
+
+if __name__ == "__main__":
+    with timings.span("fetch"):
+        main()
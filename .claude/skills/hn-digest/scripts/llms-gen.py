@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Regenerate llms.txt, the memory index Claude reads before curating.
+
+One line per digest, newest first:
+    - [2026-02-01 01:00](digests/2026/02/01-0100.org): Swift, OpenJDK, Wikipedia | 46841374, ...
+
+The topic is the "Name:" prefix of every highlight that has one, else the
+first 50 characters of the vibe. Digests come from the shared corpus cache
+(orgcorpus.py), so a warm run only stats the files.
+
+Usage:
+    ./llms-gen.py                                    # rewrite llms.txt
+    ./llms-gen.py -n                                 # dry run, print to stdout
+    ./llms-gen.py --add digests/2025/12/05-0900.org  # include a file outside the glob
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+import timings
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+OUTPUT = REPO_ROOT / "llms.txt"
+
+# first scheduled run, quoted in the Stats line
+SINCE = "2025-12-10"
+VIBE_TOPIC_LEN = 50
+
+HEADER = """\
+# Claude Reads HN
+
+> AI-curated HN digests every 5 hours. Check story IDs before curating to avoid duplicates. Update after each digest.
+
+## Digests
+
+"""
+
+FOOTER = """
+## Optional
+
+- Topics: AI/ML, security, programming, infrastructure, social, science
+- Stats: {count} digests since {since}
+"""
+
+
+def topic(head: dict) -> str:
+    names = [h.split(":")[0] for h in head["highlights"] if ":" in h]
+    return ", ".join(names) if names else head["vibe"][:VIBE_TOPIC_LEN]
+
+
+def render(heads: list) -> str:
+    heads = sorted(heads, key=lambda kh: (kh[1]["date"], kh[0]), reverse=True)
+    lines = [f"- [{h['when']}]({key}): {topic(h)} | {', '.join(s[0] for s in h['stories'])}\n"
+             for key, h in heads]
+    return HEADER + "".join(lines) + FOOTER.format(count=len(heads), since=SINCE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate llms.txt from digests")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="print instead of writing")
+    parser.add_argument("--add", nargs="+", default=[], help="extra digest files to include")
+    parser.add_argument("--digests", type=Path, default=orgcorpus.DIGESTS_DIR, help="digests dir")
+    parser.add_argument("-o", "--output", type=Path, default=OUTPUT, help="output file (default: llms.txt)")
+    parser.add_argument("--cache-dir", type=Path, default=orgcorpus.CACHE_DIR, help="corpus cache dir")
+    args = parser.parse_args()
+
+    t = perf_counter()
+    corpus, keys = orgcorpus.load(orgcorpus.digest_files(args.digests) + args.add, args.cache_dir)
+    text = render(corpus.heads(sorted(set(keys))))
+    if args.dry_run:
+        sys.stdout.write(text)
+        return
+    args.output.write_text(text, encoding="utf-8")
+    print(f"{args.output}: {len(set(keys))} digests ({corpus.rescanned} parsed, "
+          f"{(perf_counter() - t) * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    with timings.span("llms-gen"):
+        main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Send a finished digest to Telegram, Discord and Bark.
+
+Replaces the hand-built curl calls the curator used to make. The three
+channels go out concurrently over one pooled client (asynchttp.Pool);
+within a channel, sends are sequential so Telegram posts keep story order.
+
+Rate limits: a 429 is retried after the delay the server asks for
+(Telegram's parameters.retry_after, Discord's retry_after / Retry-After),
+up to --max-wait seconds. Discord's X-RateLimit-Remaining and
+X-RateLimit-Reset-After headers pace the next request before it can 429,
+and Telegram posts are spaced TELEGRAM_INTERVAL apart per chat.
+
+Every successful send is written to an idempotency journal right away,
+keyed by digest date and channel:story, so running this again after a
+partial failure only sends what is still missing.
+
+A POST is never resent once its bytes went out: a timeout or dropped
+connection after the write may still have been delivered, so the journal
+records it as "unknown" rather than "failed". Later runs leave unknown
+sends alone (a missing message beats a duplicate one) unless
+--resend-unknown says otherwise; they do not fail the run either.
+
+Channels are configured from the environment; a channel without its
+variables is skipped:
+    TG_BOT_TOKEN, TG_CHANNEL_ID      Telegram, one message per story
+    DISCORD_WEBHOOK_URL              Discord, one embed for the digest
+    BARK_SERVER, BARK_DEVICES        Bark, one push per device (comma separated)
+
+Usage:
+    ./notify.py /tmp/digest.json                    # send whatever is missing
+    ./notify.py /tmp/digest.json -n                 # print payloads, send nothing
+    ./notify.py /tmp/digest.json --resend-unknown   # also retry sends with no known outcome
+    ./notify.py /tmp/digest.json --telegram-api http://127.0.0.1:8001   # local stub
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from time import monotonic, perf_counter
+
+import timings
+from asynchttp import RETRY_STATUSES, HTTPError, Pool, Response, retry_after
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+JOURNAL = REPO_ROOT / ".cache" / "notify.json"
+JOURNAL_VERSION = 2
+JOURNAL_DIGESTS = 200
+
+BASE_URL = "https://thevibeworks.github.io/claude-reads-hn"
+HN_ITEM_URL = "https://news.ycombinator.com/item?id="
+TELEGRAM_API = "https://api.telegram.org"
+
+TELEGRAM_INTERVAL = 1.0   # Telegram asks for at most one message per second per chat
+DISCORD_COLOR = 16737280
+DISCORD_FOOTER = "Claude Reads HN • 4x daily"
+DISCORD_MAX_TITLE = 256
+DISCORD_MAX_DESCRIPTION = 4096
+BARK_GROUP = "Claude HN Digest"
+BARK_ICON = "https://raw.githubusercontent.com/thevibeworks/claude-reads-hn/main/icon.png"
+
+# 429s are handled here, with the server's own delay; the pool keeps retrying 5xx
+POOL_RETRY_STATUSES = RETRY_STATUSES - {429}
+RATE_LIMIT_TRIES = 5
+
+
+def stamp(date: str) -> str:
+    """MMDDHHMM suffix of every story anchor in a digest, from its ISO date."""
+    return date[5:7] + date[8:10] + date[11:13] + date[14:16]
+
+
+def story_url(base_url: str, date: str, story: dict) -> str:
+    return f"{base_url}#s{story['id']}-{stamp(date)}"
+
+
+def truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def telegram_text(digest: dict, story: dict, base_url: str) -> str:
+    read = escape(story_url(base_url, digest["date"], story))
+    hn = escape(story.get("hn_url") or f"{HN_ITEM_URL}{story['id']}")
+    return (f"<b>{escape(story['title'], quote=False)}</b>\n\n"
+            f"{escape(story.get('tldr', ''), quote=False)}\n\n"
+            f"<i>Take: {escape(story.get('take', ''), quote=False)}</i>\n\n"
+            f'<a href="{read}">Read →</a> | <a href="{hn}">HN</a>')
+
+
+def discord_link_text(text: str) -> str:
+    """Title usable inside [text](url): brackets would end the link early."""
+    return text.replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]")
+
+
+def discord_embed(digest: dict, base_url: str) -> dict:
+    lines = []
+    for s in digest["stories"]:
+        url = story_url(base_url, digest["date"], s).replace(")", "%29")
+        lines.append(f"• [{discord_link_text(s['title'])}]({url}) - {s.get('tldr', '')}")
+    return {"embeds": [{
+        "title": truncate(f"📰 {digest.get('vibe', '')}", DISCORD_MAX_TITLE),
+        "description": truncate("\n".join(lines), DISCORD_MAX_DESCRIPTION),
+        "url": base_url,
+        "color": DISCORD_COLOR,
+        "footer": {"text": DISCORD_FOOTER},
+    }]}
+
+
+def bark_push(digest: dict, device: str, base_url: str) -> dict:
+    stories = digest["stories"]
+    # the spiciest take: from the story with the busiest thread
+    spicy = max(stories, key=lambda s: s.get("comments_count") or 0, default={})
+    return {
+        "device_key": device,
+        "title": digest.get("vibe") or "HN digest",
+        "body": spicy.get("take") or f"{len(stories)} stories curated",
+        "url": base_url,
+        "group": BARK_GROUP,
+        "icon": BARK_ICON,
+    }
+
+
+class Journal:
+    """Sends that already went out: digest date -> {channel:key -> {at, status}}.
+
+    status is "sent" (the server said so) or "unknown" (the request went out,
+    the answer never came back). Saved after every record, so a crash mid-run
+    loses nothing that may have been delivered. Only the newest
+    JOURNAL_DIGESTS digests are kept.
+    """
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.digests = {}
+        if enabled and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == JOURNAL_VERSION:
+                    self.digests = data.get("digests", {})
+                elif data.get("version") == 1:
+                    # v1 only recorded confirmed sends, as bare timestamps
+                    self.digests = {d: {k: {"at": at, "status": "sent"} for k, at in sends.items()}
+                                    for d, sends in data.get("digests", {}).items()}
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def status(self, digest: str, key: str):
+        """"sent", "unknown", or None when this send was never attempted."""
+        return self.digests.get(digest, {}).get(key, {}).get("status")
+
+    def record(self, digest: str, key: str, status: str = "sent"):
+        if not self.enabled:
+            return
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.digests.setdefault(digest, {})[key] = {"at": now, "status": status}
+        for old in sorted(self.digests)[:-JOURNAL_DIGESTS]:
+            del self.digests[old]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": JOURNAL_VERSION, "digests": self.digests},
+                                  ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+        tmp.replace(self.path)
+
+
+class Bucket:
+    """Client-side pacing for one rate-limited endpoint (a chat, a webhook)."""
+
+    def __init__(self, interval: float = 0.0):
+        self.interval = interval
+        self.ready_at = 0.0
+
+    async def wait(self):
+        delay = self.ready_at - monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, headers: dict):
+        ready = monotonic() + self.interval
+        if headers.get("x-ratelimit-remaining") == "0":
+            ready = max(ready, monotonic() + _seconds(headers.get("x-ratelimit-reset-after")))
+        self.ready_at = ready
+
+
+def _seconds(value) -> float:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _body(resp: Response) -> dict:
+    try:
+        body = resp.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def rate_limit_delay(resp: Response) -> float:
+    """Seconds a 429 asks us to wait: body (Telegram, Discord) or headers."""
+    body = _body(resp)
+    delay = max(retry_after(resp.headers), _seconds(resp.headers.get("x-ratelimit-reset-after")),
+                _seconds((body.get("parameters") or {}).get("retry_after")),
+                _seconds(body.get("retry_after")))
+    return delay or 1.0
+
+
+def failure(resp: Response) -> str:
+    """Short reason for a non-2xx response, from the body when it has one."""
+    body = _body(resp)
+    detail = body.get("description") or body.get("message")
+    return f"HTTP {resp.status}: {detail}" if detail else f"HTTP {resp.status}"
+
+
+def new_counts() -> dict:
+    return {"sent": 0, "journaled": 0, "unknown": 0, "failed": 0}
+
+
+class Notifier:
+    def __init__(self, pool: Pool, journal: Journal, digest: dict, args):
+        self.pool = pool
+        self.journal = journal
+        self.digest = digest
+        self.args = args
+        self.stats = {}
+
+    async def post(self, channel: str, key: str, url: str, payload: dict, bucket: Bucket) -> bool:
+        """Send one payload unless the journal has it; True once it is delivered."""
+        counts = self.stats.setdefault(channel, new_counts())
+        date = self.digest["date"]
+        status = self.journal.status(date, f"{channel}:{key}")
+        if status == "sent":
+            counts["journaled"] += 1
+            return True
+        if status == "unknown" and not self.args.resend_unknown:
+            counts["unknown"] += 1
+            print(f"  warn: {channel}:{key}: outcome unknown from an earlier run, not resending "
+                  f"(--resend-unknown to force)", file=sys.stderr)
+            return False
+        if self.args.dry_run:
+            # no URL: bot tokens and webhook keys live in it
+            print(f"{channel}:{key}\n{json.dumps(payload, ensure_ascii=False, indent=2)}")
+            return True
+        try:
+            for _ in range(RATE_LIMIT_TRIES):
+                await bucket.wait()
+                resp = await self.pool.post_json(url, payload, retry_statuses=POOL_RETRY_STATUSES)
+                bucket.update(resp.headers)
+                if resp.status != 429:
+                    break
+                delay = rate_limit_delay(resp)
+                if delay > self.args.max_wait:
+                    break
+                print(f"  {channel}:{key}: rate limited, waiting {delay:.1f}s", file=sys.stderr)
+                bucket.ready_at = max(bucket.ready_at, monotonic() + delay)
+            if resp.ok:
+                self.journal.record(date, f"{channel}:{key}")
+                counts["sent"] += 1
+                return True
+            error = failure(resp)
+        except HTTPError as e:
+            error = str(e).replace(url, channel)
+            if e.maybe_sent:
+                # it may have been delivered: resending risks a duplicate post
+                self.journal.record(date, f"{channel}:{key}", "unknown")
+                counts["unknown"] += 1
+                print(f"  warn: {channel}:{key}: {error}; outcome unknown, not resending", file=sys.stderr)
+                return False
+        counts["failed"] += 1
+        print(f"  warn: {channel}:{key}: {error}", file=sys.stderr)
+        return False
+
+    async def telegram(self, token: str, chat: str):
+        url = f"{self.args.telegram_api}/bot{token}/sendMessage"
+        bucket = Bucket(self.args.telegram_interval)
+        for story in self.digest["stories"]:
+            payload = {"chat_id": chat, "parse_mode": "HTML", "disable_web_page_preview": False,
+                       "text": telegram_text(self.digest, story, self.args.base_url)}
+            await self.post("telegram", str(story["id"]), url, payload, bucket)
+
+    async def discord(self, webhook: str):
+        await self.post("discord", "digest", webhook, discord_embed(self.digest, self.args.base_url),
+                        Bucket())
+
+    async def bark(self, server: str, devices: list):
+        url = f"{server.rstrip('/')}/push"
+        # device keys are secrets: the journal only sees a short hash of each
+        await asyncio.gather(*(
+            self.post("bark", hashlib.sha1(d.encode()).hexdigest()[:10], url,
+                      bark_push(self.digest, d, self.args.base_url), Bucket())
+            for d in devices))
+
+
+async def run(digest: dict, args) -> dict:
+    env = os.environ
+    journal = Journal(args.journal, enabled=not (args.dry_run or args.no_journal))
+    async with Pool(limit=8, per_host=4, timeout=args.timeout, retries=args.retries) as pool:
+        notifier = Notifier(pool, journal, digest, args)
+        jobs = {}
+        if env.get("TG_BOT_TOKEN") and env.get("TG_CHANNEL_ID"):
+            jobs["telegram"] = notifier.telegram(env["TG_BOT_TOKEN"], env["TG_CHANNEL_ID"])
+        if env.get("DISCORD_WEBHOOK_URL"):
+            jobs["discord"] = notifier.discord(env["DISCORD_WEBHOOK_URL"])
+        devices = [d for d in env.get("BARK_DEVICES", "").replace(",", " ").split() if d]
+        if env.get("BARK_SERVER") and devices:
+            jobs["bark"] = notifier.bark(env["BARK_SERVER"], devices)
+        for channel in ("telegram", "discord", "bark"):
+            if channel not in jobs:
+                print(f"{channel}: not configured, skipped")
+
+        async def timed(channel, job):
+            t = perf_counter()
+            await job
+            c = notifier.stats.get(channel, new_counts())
+            print(f"{channel}: {c['sent']} sent, {c['journaled']} already sent, {c['unknown']} unknown, "
+                  f"{c['failed']} failed "
+                  f"({(perf_counter() - t) * 1000:.0f}ms)")
+
+        await asyncio.gather(*(timed(channel, job) for channel, job in jobs.items()))
+    return notifier.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a digest to Telegram, Discord and Bark")
+    parser.add_argument("digest", type=Path, nargs="?", default=Path("/tmp/digest.json"),
+                        help="digest JSON (default: /tmp/digest.json)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="print payloads instead of sending")
+    parser.add_argument("--journal", type=Path, default=JOURNAL, help="idempotency journal (default: .cache/notify.json)")
+    parser.add_argument("--no-journal", action="store_true", help="send everything, record nothing")
+    parser.add_argument("--resend-unknown", action="store_true",
+                        help="resend what an earlier run journaled as unknown (may duplicate)")
+    parser.add_argument("--base-url", default=BASE_URL, help="site URL the story anchors point at")
+    parser.add_argument("--telegram-api", default=TELEGRAM_API, help="Telegram Bot API base URL")
+    parser.add_argument("--telegram-interval", type=float, default=TELEGRAM_INTERVAL,
+                        help="seconds between Telegram messages (default: 1)")
+    parser.add_argument("--max-wait", type=float, default=60.0,
+                        help="longest rate-limit delay to sit through, in seconds (default: 60)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds (default: 10)")
+    parser.add_argument("--retries", type=int, default=2, help="retries before a request is written, and on 429 / 5xx with Retry-After (default: 2)")
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip("/")
+    args.telegram_api = args.telegram_api.rstrip("/")
+
+    try:
+        digest = json.loads(args.digest.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"error: {args.digest}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not digest.get("date") or not digest.get("stories"):
+        print(f"error: {args.digest}: needs a date and stories", file=sys.stderr)
+        sys.exit(1)
+
+    t = perf_counter()
+    stats = asyncio.run(run(digest, args))
+    print(f"timing: total      {perf_counter() - t:6.2f}s")
+    if any(c["failed"] for c in stats.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with timings.span("notify"):
+        main()
@@ -0,0 +1,1033 @@
+#!/usr/bin/env python3
+"""
+Render org digests into the static thread-style site.
+
+Digests come parsed from the shared corpus cache (orgcorpus.py). Every
+digest is rendered to an HTML fragment (its <section> plus sidebar links)
+and cached under .cache/org2html/, keyed by the org file's content hash,
+its path, the parser version and TEMPLATE_VERSION. A run re-renders only
+new or changed digests and stitches the pages together from cached
+fragments, so adding one digest costs the same with 300 or 3000 in the
+archive.
+
+Pages are English-only. Translations go to one shard per language per
+digest, i18n/{lang}/{YYYY-MM-DD-HHMM}.json next to the page, keyed by
+story anchor; setLang() fetches shards only for digests on screen.
+Shards no digest owns any more are deleted, and every run prints the
+page and shard bytes before -> after.
+
+The search box queries the static index search-index.py writes to
+search/ next to the page.
+
+Usage:
+    ./org2html.py digests/*/*/*.org -o index.html -d 7 -a archive.html
+    ./org2html.py digests/*/*/*.org -o index.html --rebuild   # ignore the cache
+    ./org2html.py digests/*/*/*.org -o index.html --check     # incremental == full?
+"""
+
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+import timings
+from orgcorpus import Corpus, Digest, Story
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+CACHE_DIR = REPO_ROOT / ".cache" / "org2html"
+
+# bump when render_digest() output changes in a way the template text below doesn't show
+RENDER_VERSION = 3
+
+SIDEBAR_TITLE_LEN = 40
+
+PAGE_HEAD = """\
+<!DOCTYPE html>
+<html lang="en" data-theme="dark">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Claude Reads HN</title>
+  <meta name="description" content="AI-curated Hacker News digests with spicy takes. 4x daily.">
+  <style>
+    :root {
+      --bg: #0a0a0a;
+      --bg-card: #111111;
+      --fg: #e4e4e7;
+      --fg-muted: #a1a1aa;
+      --fg-dim: #71717a;
+      --accent: #f97316;
+      --link: #60a5fa;
+      --border: #27272a;
+      --tldr: #a78bfa;
+      --take: #f472b6;
+      --comment: #34d399;
+      --sidebar-bg: #18181b;
+    }
+    [data-theme="light"] {
+      --bg: #ffffff;
+      --bg-card: #f9fafb;
+      --fg: #18181b;
+      --fg-muted: #52525b;
+      --fg-dim: #a1a1aa;
+      --accent: #ea580c;
+      --link: #2563eb;
+      --border: #e5e7eb;
+      --sidebar-bg: #f3f4f6;
+    }
+    * { box-sizing: border-box; margin: 0; padding: 0; }
+    html { scroll-behavior: smooth; }
+    body {
+      font-family: Courier, monospace;
+      background: var(--bg);
+      color: var(--fg);
+      line-height: 1.7;
+    }
+    .layout {
+      display: flex;
+      max-width: 1100px;
+      margin: 0 auto;
+    }
+    .sidebar {
+      width: 240px;
+      position: sticky;
+      top: 0;
+      height: 100vh;
+      overflow-y: auto;
+      padding: 1rem;
+      background: var(--sidebar-bg);
+      border-left: 1px solid var(--border);
+      font-size: 0.75rem;
+      flex-shrink: 0;
+      order: 1;
+    }
+    .sidebar-title {
+      font-weight: bold;
+      margin-bottom: 1rem;
+      color: var(--fg-muted);
+      text-transform: uppercase;
+      font-size: 0.7rem;
+      letter-spacing: 0.05em;
+    }
+    .sidebar-date {
+      color: var(--fg-dim);
+      font-size: 0.7rem;
+      margin-top: 1rem;
+      margin-bottom: 0.5rem;
+    }
+    .sidebar a {
+      display: block;
+      color: var(--fg-muted);
+      text-decoration: none;
+      padding: 0.25rem 0;
+      border-left: 2px solid transparent;
+      padding-left: 0.5rem;
+      margin-left: -0.5rem;
+      transition: color 0.2s, border-color 0.2s;
+    }
+    .sidebar a:hover {
+      color: var(--accent);
+      border-left-color: var(--accent);
+    }
+    .sidebar a.active {
+      color: var(--accent);
+      border-left-color: var(--accent);
+      font-weight: bold;
+    }
+    .main {
+      flex: 1;
+      min-width: 0;
+      padding: 2rem 1.5rem;
+    }
+    header {
+      display: flex;
+      justify-content: space-between;
+      align-items: center;
+      margin-bottom: 2rem;
+      padding-bottom: 1rem;
+      border-bottom: 1px solid var(--border);
+      flex-wrap: wrap;
+      gap: 0.5rem;
+    }
+    .header-left {
+      display: flex;
+      align-items: center;
+      gap: 1rem;
+    }
+    .logo { font-weight: bold; font-size: 1.1rem; }
+    .header-links { font-size: 0.8rem; }
+    .header-links a { color: var(--link); margin-right: 0.75rem; text-decoration: none; }
+    .header-links a:hover { text-decoration: underline; }
+    .controls { display: flex; align-items: center; gap: 0.25rem; }
+    .icon-btn {
+      background: none;
+      border: 1px solid var(--border);
+      color: var(--fg);
+      padding: 0.4rem;
+      cursor: pointer;
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      border-radius: 4px;
+    }
+    .icon-btn:hover { background: var(--bg-card); }
+    .icon-btn svg { display: block; }
+    .lang-select {
+      position: relative;
+      display: inline-block;
+    }
+    .lang-menu {
+      display: none;
+      position: absolute;
+      right: 0;
+      top: 100%;
+      background: var(--bg-card);
+      border: 1px solid var(--border);
+      border-radius: 4px;
+      min-width: 60px;
+      z-index: 100;
+    }
+    .lang-select:hover .lang-menu,
+    .lang-menu:hover { display: block; }
+    .lang-menu button {
+      display: block;
+      width: 100%;
+      text-align: left;
+      background: none;
+      border: none;
+      color: var(--fg);
+      padding: 0.4rem 0.6rem;
+      cursor: pointer;
+      font-family: inherit;
+      font-size: 0.85rem;
+    }
+    .lang-menu button:hover { background: var(--border); }
+    .lang-menu button.active { color: var(--accent); }
+    .search { position: relative; }
+    .search input {
+      background: var(--bg-card);
+      border: 1px solid var(--border);
+      color: var(--fg);
+      padding: 0.35rem 0.5rem;
+      border-radius: 4px;
+      font-family: inherit;
+      font-size: 0.8rem;
+      width: 12rem;
+    }
+    .search input:focus { outline: none; border-color: var(--accent); }
+    .search-results {
+      position: absolute;
+      right: 0;
+      top: 100%;
+      margin-top: 0.25rem;
+      width: 24rem;
+      max-width: 90vw;
+      max-height: 60vh;
+      overflow-y: auto;
+      background: var(--bg-card);
+      border: 1px solid var(--border);
+      border-radius: 4px;
+      z-index: 100;
+    }
+    .search-results a {
+      display: block;
+      padding: 0.4rem 0.6rem;
+      color: var(--fg);
+      text-decoration: none;
+      font-size: 0.8rem;
+    }
+    .search-results a:hover { background: var(--border); color: var(--accent); }
+    .search-when { display: block; font-size: 0.7rem; color: var(--fg-dim); }
+    .search-empty { padding: 0.4rem 0.6rem; font-size: 0.8rem; color: var(--fg-dim); }
+    .digest { margin-bottom: 3rem; }
+    .digest-header { margin-bottom: 1.5rem; }
+    .digest-date { font-size: 0.8rem; color: var(--fg-dim); }
+    .digest-vibe { font-style: italic; color: var(--fg-muted); margin-top: 0.5rem; }
+    .story { margin-bottom: 2rem; padding: 1rem; background: var(--bg-card); border-radius: 6px; scroll-margin-top: 1rem; }
+    .story-title { font-size: 1rem; margin-bottom: 0.25rem; }
+    .story-title a { color: var(--fg); text-decoration: none; }
+    .story-title a:hover { color: var(--accent); }
+    .story-anchor { color: var(--fg-dim); text-decoration: none; font-size: 0.8rem; margin-left: 0.5rem; opacity: 0; transition: opacity 0.2s; }
+    .story:hover .story-anchor { opacity: 1; }
+    .story-anchor:hover { color: var(--accent); }
+    .story-meta { font-size: 0.75rem; color: var(--fg-dim); margin-bottom: 1rem; }
+    .story-meta a { color: var(--link); }
+    .story-section { margin-bottom: 1rem; }
+    .story-label { font-size: 0.7rem; text-transform: uppercase; margin-bottom: 0.25rem; }
+    .story-tldr .story-label { color: var(--tldr); }
+    .story-take .story-label { color: var(--take); }
+    .story-comments .story-label { color: var(--comment); }
+    .story-text { font-size: 0.9rem; color: var(--fg-muted); }
+    .i18n-text {
+      display: block;
+      margin-top: 0.4rem;
+      padding-left: 0.75rem;
+      color: var(--fg-dim);
+      font-size: 0.85rem;
+      border-left: 2px dashed var(--border);
+    }
+    .i18n-title {
+      font-size: 0.9rem;
+      color: var(--fg-dim);
+      margin-top: 0.25rem;
+    }
+    .comment { padding: 0.75rem 1rem; background: var(--bg); border-radius: 4px; margin-bottom: 0.5rem; border-left: 3px solid var(--comment); }
+    .comment:nth-child(2) { border-left-color: var(--take); }
+    .comment:nth-child(3) { border-left-color: var(--tldr); }
+    .comment-text { font-size: 0.9rem; }
+    .comment-author { font-size: 0.7rem; color: var(--fg-dim); margin-top: 0.5rem; }
+    .comment-i18n { font-size: 0.8rem; color: var(--fg-dim); margin-top: 0.4rem; padding-left: 0.75rem; border-left: 2px dashed var(--border); }
+    .tags { margin-top: 1rem; }
+    .tag { display: inline-block; background: var(--border); padding: 0.1rem 0.4rem; border-radius: 3px; font-size: 0.75rem; margin-right: 0.25rem; }
+    .hidden { display: none; }
+    .back-to-top {
+      position: fixed;
+      bottom: 2rem;
+      right: 2rem;
+      background: var(--bg-card);
+      border: 1px solid var(--border);
+      color: var(--fg);
+      width: 40px;
+      height: 40px;
+      border-radius: 50%;
+      cursor: pointer;
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      opacity: 0;
+      transition: opacity 0.3s;
+      z-index: 100;
+    }
+    .back-to-top.visible { opacity: 1; }
+    .back-to-top:hover { background: var(--accent); color: white; }
+    .archive-link {
+      display: block;
+      width: 100%;
+      padding: 1rem;
+      margin: 2rem 0;
+      background: var(--bg-card);
+      border: 1px dashed var(--border);
+      color: var(--fg-muted);
+      font-family: inherit;
+      font-size: 0.9rem;
+      text-decoration: none;
+      text-align: center;
+      border-radius: 6px;
+      transition: border-color 0.2s, color 0.2s;
+    }
+    .archive-link:hover {
+      border-color: var(--accent);
+      color: var(--accent);
+    }
+    @media (max-width: 800px) {
+      .sidebar { display: none; }
+      .main { padding: 1rem; }
+    }
+  </style>
+</head>
+<body>
+  <div class="layout">
+    <aside class="sidebar">
+      <div class="sidebar-title">Highlights</div>
+"""
+
+MAIN_HEAD = """\
+    </aside>
+    <div class="main">
+      <header>
+        <div class="header-left">
+          <div class="logo">Claude Reads HN</div>
+          <div class="header-links">
+            <a href="https://github.com/thevibeworks/claude-reads-hn">github</a>
+            <a href="https://t.me/claudehn">telegram</a>
+          </div>
+        </div>
+        <div class="controls">
+          <div class="search">
+            <input type="search" id="search-input" placeholder="Search digests" aria-label="Search digests" autocomplete="off">
+            <div id="search-results" class="search-results hidden"></div>
+          </div>
+          <button onclick="toggleTheme()" title="Toggle theme" class="icon-btn">
+            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+              <circle cx="12" cy="12" r="5"/><path d="M12 1v2M12 21v2M4.22 4.22l1.42 1.42M18.36 18.36l1.42 1.42M1 12h2M21 12h2M4.22 19.78l1.42-1.42M18.36 5.64l1.42-1.42"/>
+            </svg>
+          </button>
+          <div class="lang-select">
+            <button class="icon-btn" title="Language">
+              <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                <circle cx="12" cy="12" r="10"/><path d="M2 12h20M12 2a15.3 15.3 0 0 1 4 10 15.3 15.3 0 0 1-4 10 15.3 15.3 0 0 1-4-10 15.3 15.3 0 0 1 4-10z"/>
+              </svg>
+            </button>
+            <div class="lang-menu">
+              <button onclick="setLang('en')" data-lang="en" class="active">EN</button>
+              <button onclick="setLang('es')" data-lang="es">ES</button>
+              <button onclick="setLang('de')" data-lang="de">DE</button>
+              <button onclick="setLang('ko')" data-lang="ko">KO</button>
+              <button onclick="setLang('ja')" data-lang="ja">JA</button>
+              <button onclick="setLang('zh')" data-lang="zh">ZH</button>
+            </div>
+          </div>
+        </div>
+      </header>
+      <main id="feed">
+"""
+
+ARCHIVE_LINK = """
+    <a href="archive.html" class="archive-link">
+      View older digests →
+    </a>"""
+
+INDEX_LINK = """
+    <a href="index.html" class="archive-link">
+      ← Back to latest digests
+    </a>"""
+
+PAGE_TAIL = """
+      </main>
+    </div>
+  </div>
+  <button class="back-to-top" onclick="window.scrollTo({top:0,behavior:'smooth'})" title="Back to top">
+    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+      <path d="M18 15l-6-6-6 6"/>
+    </svg>
+  </button>
+  <script>
+    let currentLang = 'en';
+    function safeStorage(key, value) {
+      try {
+        if (value === undefined) return localStorage.getItem(key);
+        localStorage.setItem(key, value);
+        return value;
+      } catch (e) { return null; }
+    }
+    function toggleTheme() {
+      const html = document.documentElement;
+      const isDark = html.getAttribute('data-theme') === 'dark';
+      const newTheme = isDark ? 'light' : 'dark';
+      html.setAttribute('data-theme', newTheme);
+      safeStorage('hn-theme', newTheme);
+    }
+    function setLang(lang) {
+      currentLang = lang;
+      document.querySelectorAll('.lang-menu button[data-lang]').forEach(b => {
+        b.classList.toggle('active', b.dataset.lang === lang);
+      });
+      showLang(document);
+      visibleDigests.forEach(translateDigest);
+      safeStorage('hn-lang', lang);
+    }
+    function showLang(root) {
+      root.querySelectorAll('.i18n-text, .i18n-title, .comment-i18n').forEach(el => {
+        el.classList.toggle('hidden', el.dataset.lang !== currentLang);
+      });
+    }
+    // Translations live in i18n/{lang}/{digest}.json, fetched per digest on screen
+    const shards = new Map();
+    function loadShard(lang, digest) {
+      const key = lang + '/' + digest;
+      if (!shards.has(key)) {
+        shards.set(key, fetch('i18n/' + key + '.json')
+          .then(r => r.ok ? r.json() : null)
+          .catch(() => null));
+      }
+      return shards.get(key);
+    }
+    function addI18n(parent, before, tag, cls, lang, text) {
+      if (!parent || !text || parent.querySelector(':scope > .' + cls + '[data-lang="' + lang + '"]')) return;
+      const el = document.createElement(tag);
+      el.className = cls;
+      el.dataset.lang = lang;
+      el.textContent = text;
+      parent.insertBefore(el, before);
+    }
+    function applyShard(section, lang, shard) {
+      section.querySelectorAll('.story').forEach(story => {
+        const tr = shard[story.id];
+        if (!tr) return;
+        addI18n(story, story.querySelector('.story-meta'), 'div', 'i18n-title', lang, tr.title);
+        addI18n(story.querySelector('.story-tldr'), null, 'span', 'i18n-text', lang, tr.tldr);
+        addI18n(story.querySelector('.story-take'), null, 'span', 'i18n-text', lang, tr.take);
+        story.querySelectorAll('.comment').forEach((c, i) => {
+          addI18n(c, c.querySelector('.comment-author'), 'div', 'comment-i18n', lang, (tr.comments || [])[i]);
+        });
+      });
+      showLang(section);
+    }
+    function translateDigest(section) {
+      const lang = currentLang;
+      if (lang === 'en' || !section.dataset.langs.split(' ').includes(lang)) return;
+      loadShard(lang, section.dataset.i18n).then(shard => {
+        if (shard) applyShard(section, lang, shard);
+      });
+    }
+    const visibleDigests = new Set();
+    const i18nDigests = document.querySelectorAll('section.digest[data-i18n]');
+    if ('IntersectionObserver' in window) {
+      const observer = new IntersectionObserver(entries => {
+        entries.forEach(e => {
+          if (e.isIntersecting) {
+            visibleDigests.add(e.target);
+            translateDigest(e.target);
+          } else {
+            visibleDigests.delete(e.target);
+          }
+        });
+      }, { rootMargin: '400px 0px' });
+      i18nDigests.forEach(section => observer.observe(section));
+    } else {
+      i18nDigests.forEach(section => visibleDigests.add(section));
+    }
+    // Search: search/meta.json carries the tokenizer settings and the term shard
+    // boundaries (search-index.py); a query fetches one shard per term and
+    // segment, then the doc chunks holding its top results
+    const searchFiles = new Map();
+    let searchMeta = null;
+    function searchFetch(name) {
+      if (!searchFiles.has(name)) {
+        searchFiles.set(name, fetch('search/' + name)
+          .then(r => r.ok ? r.json() : null)
+          .catch(() => null));
+      }
+      return searchFiles.get(name);
+    }
+    function loadSearchMeta() {
+      if (!searchMeta) {
+        searchMeta = searchFetch('meta.json').then(meta => {
+          if (!meta) return null;
+          meta.stopSet = new Set(meta.stop);
+          meta.cjkRe = new RegExp('[' + meta.cjk + ']+', 'g');
+          meta.cjkChar = new RegExp('^[' + meta.cjk + ']$');
+          return meta;
+        });
+      }
+      return searchMeta;
+    }
+    // same terms as search-index.py terms(): CJK bigrams, folded words minus stopwords
+    function searchTerms(meta, text) {
+      text = text.normalize('NFKC').toLowerCase();
+      const out = new Set();
+      (text.match(meta.cjkRe) || []).forEach(run => {
+        if (run.length === 1) out.add(run);
+        for (let i = 0; i + 1 < run.length; i++) out.add(run.slice(i, i + 2));
+      });
+      (text.replace(meta.cjkRe, ' ').match(/[\\p{L}\\p{N}]+/gu) || []).forEach(w => {
+        if (/[^\\x00-\\x7f]/.test(w)) w = w.normalize('NFKD').replace(/[\\u0300-\\u036f]/g, '');
+        if (w && [...w].length <= meta.maxterm && !meta.stopSet.has(w)) out.add(w);
+      });
+      return [...out].sort();
+    }
+    const POSTING_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_';
+    function decodePostings(code, docs) {
+      let doc = 0, n = 0;
+      for (let i = 0; i < code.length; i++) {
+        const c = POSTING_DIGITS.indexOf(code[i]);
+        n = n * 32 + (c & 31);
+        if (c < 32) {
+          doc += n;
+          n = 0;
+          const w = POSTING_DIGITS.indexOf(code[++i]);
+          docs.set(doc, Math.max(docs.get(doc) || 0, w));
+        }
+      }
+    }
+    function shardIndex(segment, term) {
+      let lo = 0, hi = segment.length - 1;
+      while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (segment[mid][0] <= term) lo = mid; else hi = mid - 1;
+      }
+      return lo;
+    }
+    // shards whose term ranges meet [lo, hi], descending through directories
+    async function findShards(entries, lo, hi) {
+      const files = await Promise.all(entries.slice(shardIndex(entries, lo), shardIndex(entries, hi) + 1)
+        .map(e => searchFetch(e[1])));
+      const found = await Promise.all(files.map(f => Array.isArray(f) ? findShards(f, lo, hi) : [f]));
+      return found.flat();
+    }
+    // doc -> weight; a lone CJK character matches every bigram it starts
+    async function termPostings(meta, term) {
+      const prefix = meta.cjkChar.test(term);
+      const docs = new Map();
+      await Promise.all(meta.segments.map(async seg => {
+        const shards = await findShards(seg, term, prefix ? term + '\\uffff' : term);
+        shards.forEach(shard => {
+          if (!shard) return;
+          if (!prefix) {
+            if (shard[term]) decodePostings(shard[term], docs);
+            return;
+          }
+          Object.keys(shard).forEach(t => {
+            if (t.startsWith(term)) decodePostings(shard[t], docs);
+          });
+        });
+      }));
+      return docs;
+    }
+    // [[anchor, title, when]] best first: docs with every term if any, else any term
+    async function runSearch(query) {
+      const meta = await loadSearchMeta();
+      if (!meta) return null;
+      const lists = await Promise.all(searchTerms(meta, query).map(t => termPostings(meta, t)));
+      const scores = new Map();
+      lists.forEach(p => {
+        if (!p.size) return;
+        const idf = Math.log(1 + meta.docs / p.size);
+        p.forEach((w, doc) => scores.set(doc, (scores.get(doc) || 0) + w * idf));
+      });
+      let hits = [...scores.keys()].filter(doc => lists.every(p => p.has(doc)));
+      if (!hits.length) hits = [...scores.keys()];
+      hits.sort((a, b) => scores.get(b) - scores.get(a) || b - a);
+      const docs = await Promise.all(hits.slice(0, meta.results).map(doc =>
+        searchFetch('d/' + Math.floor(doc / meta.chunk) + '.json')
+          .then(chunk => chunk && chunk[doc % meta.chunk])));
+      return docs.filter(Boolean);
+    }
+    // stories on the other page (index <-> archive) are reached through its link
+    function searchHref(anchor) {
+      if (document.getElementById(anchor)) return '#' + anchor;
+      const other = document.querySelector('.archive-link');
+      return (other ? other.getAttribute('href') : '') + '#' + anchor;
+    }
+    const searchInput = document.getElementById('search-input');
+    const searchResults = document.getElementById('search-results');
+    function showResults(results) {
+      searchResults.replaceChildren();
+      (results || []).forEach(([anchor, title, when]) => {
+        const a = document.createElement('a');
+        a.href = searchHref(anchor);
+        a.textContent = title;
+        const date = document.createElement('span');
+        date.className = 'search-when';
+        date.textContent = when;
+        a.appendChild(date);
+        searchResults.appendChild(a);
+      });
+      if (!searchResults.children.length) {
+        const empty = document.createElement('div');
+        empty.className = 'search-empty';
+        empty.textContent = results ? 'No matches' : 'Search unavailable';
+        searchResults.appendChild(empty);
+      }
+      searchResults.classList.remove('hidden');
+    }
+    let searchTimer = null, searchSeq = 0;
+    function hideResults() {
+      clearTimeout(searchTimer);
+      searchSeq++;
+      searchResults.classList.add('hidden');
+    }
+    searchInput.addEventListener('input', () => {
+      clearTimeout(searchTimer);
+      const query = searchInput.value.trim();
+      const seq = ++searchSeq;
+      if (!query) {
+        searchResults.classList.add('hidden');
+        return;
+      }
+      searchTimer = setTimeout(() => {
+        runSearch(query).then(results => { if (seq === searchSeq) showResults(results); });
+      }, 200);
+    });
+    searchInput.addEventListener('keydown', e => {
+      if (e.key === 'Escape') {
+        searchInput.value = '';
+        hideResults();
+      }
+    });
+    searchResults.addEventListener('click', e => {
+      if (e.target.closest('a')) hideResults();
+    });
+    // Back to top visibility
+    window.addEventListener('scroll', () => {
+      document.querySelector('.back-to-top').classList.toggle('visible', window.scrollY > 500);
+    });
+
+    // Scroll spy for sidebar
+    const stories = document.querySelectorAll('.story');
+    const sidebarLinks = document.querySelectorAll('.sidebar a[href^="#s"]');
+    const sidebar = document.querySelector('.sidebar');
+
+    function updateActiveLink() {
+      let current = '';
+      stories.forEach(story => {
+        const rect = story.getBoundingClientRect();
+        if (rect.top <= 150 && rect.bottom > 150) {
+          current = story.id;
+        }
+      });
+      sidebarLinks.forEach(link => {
+        const isActive = link.getAttribute('href') === '#' + current;
+        link.classList.toggle('active', isActive);
+        if (isActive && sidebar) {
+          const linkRect = link.getBoundingClientRect();
+          const sidebarRect = sidebar.getBoundingClientRect();
+          if (linkRect.top < sidebarRect.top + 50 || linkRect.bottom > sidebarRect.bottom - 50) {
+            link.scrollIntoView({ block: 'center', behavior: 'smooth' });
+          }
+        }
+      });
+    }
+
+    window.addEventListener('scroll', updateActiveLink, { passive: true });
+    updateActiveLink();
+    (function init() {
+      const savedTheme = safeStorage('hn-theme');
+      if (savedTheme) document.documentElement.setAttribute('data-theme', savedTheme);
+      const savedLang = safeStorage('hn-lang');
+      if (savedLang && savedLang !== 'en') setLang(savedLang);
+    })();
+  </script>
+</body>
+</html>
+"""
+
+DIGEST_TMPL = """<section class="digest"{i18n_attrs}>
+      <div class="digest-header">
+        <div class="digest-date">{date}</div>
+        <div class="digest-vibe">{vibe}</div>
+      </div>
+      {stories}
+    </section>"""
+
+STORY_TMPL = """<article class="story" id="{anchor}">
+      <h3 class="story-title">
+        <a href="{url}" target="_blank">{title}</a>
+        <a href="#{anchor}" class="story-anchor">#</a>
+      </h3>
+      <div class="story-meta">
+        {points}pts | {comments_count}c | <a href="{hn_url}" target="_blank">HN#{id}</a>
+      </div>
+      <div class="story-section story-tldr">
+        <div class="story-label">TL;DR</div>
+        <div class="story-text">{tldr}</div>
+      </div>
+      <div class="story-section story-take">
+        <div class="story-label">Take</div>
+        <div class="story-text">{take}</div>
+      </div>
+      <div class="story-section story-comments">
+        <div class="story-label">HN Voices</div>
+        {comments}
+      </div>
+      {tags}
+    </article>"""
+
+COMMENT_TMPL = """<div class="comment">
+          <div class="comment-text">"{text}"</div>
+          <div class="comment-author">-- {by}</div>
+        </div>"""
+
+TEMPLATE_VERSION = hashlib.sha256(
+    "\0".join([str(RENDER_VERSION), DIGEST_TMPL, STORY_TMPL, COMMENT_TMPL]).encode()
+).hexdigest()[:16]
+
+
+def esc(s) -> str:
+    return html.escape(str(s), quote=True)
+
+
+def render_story(story: Story, stamp: str) -> str:
+    anchor = f"s{story.id}-{stamp}"
+    props = story.props
+    comments = "".join(COMMENT_TMPL.format(text=esc(c.text), by=esc(c.by))
+                       for c in story.comments)
+    tags = ""
+    if story.tags:
+        tags = '<div class="tags">' + "".join(
+            f'<span class="tag">#{esc(t)}</span>' for t in story.tags) + "</div>"
+    return STORY_TMPL.format(
+        anchor=anchor,
+        id=esc(story.id),
+        url=esc(props.get("URL", "")),
+        hn_url=esc(props.get("HN_URL", "")),
+        title=esc(story.title),
+        points=esc(props.get("POINTS", "0")),
+        comments_count=esc(props.get("COMMENTS", "0")),
+        tldr=esc(story.tldr),
+        take=esc(story.take),
+        comments=comments,
+        tags=tags,
+    )
+
+
+def i18n_shards(digest: Digest) -> dict:
+    """lang -> {anchor: {title, tldr, take, comments}} for one digest."""
+    shards = {}
+    for story in digest.stories:
+        anchor = f"s{story.id}-{digest.stamp}"
+        for lang, tr in story.i18n.items():
+            entry = {k: tr[k] for k in ("title", "tldr", "take", "comments") if tr.get(k)}
+            if entry:
+                shards.setdefault(lang, {})[anchor] = entry
+    return {lang: json.dumps(shard, ensure_ascii=False, separators=(",", ":"))
+            for lang, shard in shards.items()}
+
+
+def sidebar_title(title: str) -> str:
+    short = esc(title)[:SIDEBAR_TITLE_LEN]
+    return short + "..." if len(title) > SIDEBAR_TITLE_LEN else short
+
+
+def render_digest(digest: Digest) -> dict:
+    """Render one digest into a cacheable fragment record."""
+    stamp = digest.stamp
+    shard = f"{digest.date[:10]}-{digest.date[11:13]}{digest.date[14:16]}"
+    i18n = i18n_shards(digest)
+    i18n_attrs = f' data-i18n="{esc(shard)}" data-langs="{" ".join(i18n)}"' if i18n else ""
+    section = DIGEST_TMPL.format(
+        i18n_attrs=i18n_attrs,
+        date=esc(digest.date),
+        vibe=esc(digest.vibe),
+        stories="\n".join(render_story(s, stamp) for s in digest.stories),
+    )
+    links = "".join(f'      <a href="#s{s.id}-{stamp}">{sidebar_title(s.title)}</a>\n'
+                    for s in digest.stories)
+    return {"path": digest.path, "date": digest.date, "day": digest.date[:10],
+            "section": section, "sidebar": links, "shard": shard, "langs": list(i18n),
+            "i18n": i18n}
+
+
+def render_page(fragments: list, footer: str) -> str:
+    sidebar, day = [], None
+    for f in fragments:
+        if f["day"] != day:
+            day = f["day"]
+            sidebar.append(f'      <div class="sidebar-date">{esc(day)}</div>\n')
+        sidebar.append(f["sidebar"])
+    return (PAGE_HEAD + "".join(sidebar) + MAIN_HEAD
+            + "\n".join(f["section"] for f in fragments)
+            + footer + PAGE_TAIL)
+
+
+class FragmentCache:
+    """Rendered digest fragments on disk, keyed by content hash + template version.
+
+    The content hash comes from the corpus manifest, so unchanged files are
+    not even opened. Translations are stored next to each fragment
+    (KEY.i18n.json) and only read back when a shard file has gone missing;
+    cached fragments come back without "i18n". If those are gone too (i18n/
+    deleted, a partial cache restore), the digest is rendered again.
+    """
+
+    def __init__(self, root: Path, corpus: Corpus, enabled: bool = True):
+        self.root = root
+        self.corpus = corpus
+        self.enabled = enabled
+        self.hits = self.misses = 0
+        self.rendered = set()
+        self.live = set()
+        self.paths = {}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def fragment(self, path: str) -> dict:
+        key = hashlib.sha256("\0".join(
+            [TEMPLATE_VERSION, str(orgcorpus.PARSER_VERSION), path, self.corpus.sha1(path)]
+        ).encode()).hexdigest()
+        self.live.add(key)
+        self.paths[key] = path
+        cached = self._load(self._entry_path(key)) if self.enabled else None
+        if cached is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.rendered.add(path)
+            cached = render_digest(self.corpus.digest(path))
+            self._store(key, cached)
+        cached["key"] = key
+        return cached
+
+    def shards(self, frag: dict) -> dict:
+        """lang -> shard JSON for a cached fragment, re-rendered if the cache lacks any."""
+        i18n = self._load(self._entry_path(frag["key"]).with_suffix(".i18n.json"))
+        if not isinstance(i18n, dict) or not set(frag["langs"]) <= i18n.keys():
+            path = self.paths[frag["key"]]
+            rendered = render_digest(self.corpus.digest(path))
+            self.rendered.add(path)
+            self.hits, self.misses = self.hits - 1, self.misses + 1
+            self._store(frag["key"], rendered)
+            i18n = rendered["i18n"]
+        return i18n
+
+    def _load(self, entry: Path):
+        try:
+            with open(entry, "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, frag: dict):
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        parts = ((entry, {k: v for k, v in frag.items() if k != "i18n"}),
+                 (entry.with_suffix(".i18n.json"), frag["i18n"]))
+        for path, data in parts:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+
+    def save(self):
+        """Drop entries no current digest points to."""
+        for entry in self.root.glob("??/*.json"):
+            if entry.name.split(".")[0] not in self.live:
+                entry.unlink()
+
+
+def expand(patterns: list) -> list:
+    """Expand globs ourselves so unmatched shell patterns are just skipped."""
+    files = set()
+    for p in patterns:
+        matches = glob.glob(p) if glob.has_magic(p) else [p]
+        files.update(m for m in matches if m.endswith((".org", ".md")) and os.path.isfile(m))
+    return sorted(files)
+
+
+def existing_shards(i18n_dir: Path) -> dict:
+    """Shard file -> bytes for everything currently under i18n_dir/{lang}/."""
+    found = {}
+    try:
+        langs = list(os.scandir(i18n_dir))
+    except FileNotFoundError:
+        return found
+    for lang in langs:
+        if lang.is_dir():
+            for entry in os.scandir(lang.path):
+                if entry.name.endswith(".json") and entry.is_file():
+                    found[entry.path] = entry.stat().st_size
+    return found
+
+
+def prune_shards(fragments: list, i18n_dir: Path, existing: dict) -> int:
+    """Delete shards no digest in this build owns (removed digests, dropped languages)."""
+    wanted = {os.path.join(i18n_dir, lang, f"{f['shard']}.json") for f in fragments for lang in f["langs"]}
+    stale = [path for path in existing if path not in wanted]
+    for path in stale:
+        os.unlink(path)
+    for lang in {os.path.dirname(path) for path in stale}:
+        if not os.listdir(lang):
+            os.rmdir(lang)
+    return len(stale)
+
+
+def write_shards(fragments: list, i18n_dir: Path, cache: FragmentCache) -> dict:
+    """Write translation shards for re-rendered digests (or missing files).
+
+    Returns bytes per language across all shards, for the size report.
+    """
+    sizes = {}
+    for f in fragments:
+        i18n = f.get("i18n")
+        for lang in f["langs"]:
+            out = os.path.join(i18n_dir, lang, f"{f['shard']}.json")
+            if i18n is None:
+                try:
+                    sizes[lang] = sizes.get(lang, 0) + os.stat(out).st_size
+                    continue
+                except FileNotFoundError:
+                    i18n = cache.shards(f)
+            data = i18n[lang].encode("utf-8")
+            sizes[lang] = sizes.get(lang, 0) + len(data)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            with open(out, "wb") as fh:
+                fh.write(data)
+    return sizes
+
+
+def read_shards(fragments: list, i18n_dir: Path) -> list:
+    shards = []
+    for f in fragments:
+        shards.append({lang: (i18n_dir / lang / f"{f['shard']}.json").read_text(encoding="utf-8")
+                       for lang in f["langs"]})
+    return shards
+
+
+def size_change(old: int, new: int) -> str:
+    if old == new:
+        return f"{new:,} bytes (unchanged)"
+    pct = f", {(new / old - 1) * 100:+.1f}%" if old else ""
+    return f"{old:,} -> {new:,} bytes{pct}"
+
+
+def build(keys: list, days: int, archive: bool, cache: FragmentCache) -> tuple:
+    fragments = [cache.fragment(k) for k in keys]
+    fragments.sort(key=lambda f: (f["date"], f["path"]), reverse=True)
+    if not days or not fragments:
+        return render_page(fragments, ""), None, fragments
+    newest = date.fromisoformat(fragments[0]["day"])
+    cutoff = (newest - timedelta(days=days)).isoformat()
+    recent = [f for f in fragments if f["day"] >= cutoff]
+    older = [f for f in fragments if f["day"] < cutoff]
+    index = render_page(recent, ARCHIVE_LINK if archive and older else "")
+    archive_html = render_page(older, INDEX_LINK) if archive else None
+    return index, archive_html, fragments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render org digests to HTML")
+    parser.add_argument("files", nargs="+", help="org digest files or globs")
+    parser.add_argument("-o", "--output", default="index.html", help="main page (default: index.html)")
+    parser.add_argument("-d", "--days", type=int, default=0, help="days on the main page (default: all)")
+    parser.add_argument("-a", "--archive", help="page for digests older than --days")
+    parser.add_argument("--i18n-dir", type=Path,
+                        help="translation shards dir (default: i18n/ next to the main page)")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="fragment cache dir")
+    parser.add_argument("--corpus-cache", type=Path, default=orgcorpus.CACHE_DIR, help="parsed digest cache dir")
+    parser.add_argument("--rebuild", action="store_true", help="ignore all caches, parse and render everything")
+    parser.add_argument("--check", action="store_true",
+                        help="verify incremental output is byte-identical to a full rebuild")
+    args = parser.parse_args()
+
+    files = expand(args.files)
+    if not files:
+        print("error: no digest files", file=sys.stderr)
+        sys.exit(1)
+
+    t = perf_counter()
+    corpus = Corpus(args.corpus_cache, enabled=not args.rebuild)
+    keys = corpus.update(files)
+    cache = FragmentCache(args.cache_dir, corpus, enabled=not args.rebuild)
+    index, archive, fragments = build(keys, args.days, bool(args.archive), cache)
+    i18n_dir = args.i18n_dir or Path(args.output).parent / "i18n"
+    before = existing_shards(i18n_dir)
+    sizes = write_shards(fragments, i18n_dir, cache)
+    pruned = prune_shards(fragments, i18n_dir, before)
+    corpus.save()
+    cache.save()
+    elapsed = perf_counter() - t
+
+    if args.check:
+        fresh = Corpus(args.corpus_cache, enabled=False)
+        full = build(fresh.update(files), args.days, bool(args.archive),
+                     FragmentCache(args.cache_dir, fresh, enabled=False))
+        shards = read_shards(fragments, i18n_dir)
+        if (index, archive, shards) != (full[0], full[1], [f["i18n"] for f in full[2]]):
+            print("error: incremental output differs from full rebuild", file=sys.stderr)
+            sys.exit(1)
+        print("check: incremental output identical to full rebuild")
+
+    for page, html_text in ((args.output, index), (args.archive, archive)):
+        if page:
+            old = os.path.getsize(page) if os.path.exists(page) else 0
+            Path(page).write_text(html_text, encoding="utf-8")
+            print(f"{page}: {size_change(old, len(html_text.encode()))}")
+    if sizes or before:
+        shard_count = sum(len(f["langs"]) for f in fragments)
+        per_lang = ", ".join(f"{lang} {n:,}" for lang, n in sorted(sizes.items()))
+        print(f"{i18n_dir}/: {len(before)} -> {shard_count} shards ({pruned} pruned), "
+              f"{size_change(sum(before.values()), sum(sizes.values()))} ({per_lang})")
+    print(f"{len(files)} digests: {cache.misses} rendered, {cache.hits} cached ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    with timings.span("org2html"):
+        main()
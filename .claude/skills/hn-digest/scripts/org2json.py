@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Org digests -> JSON.
+
+Single digest: print it back in the /tmp/digest.json shape the curator
+writes (json2org.py input), to validate the round trip.
+
+Index: rewrite digests.json and digests.org, the story-ID indexes for the
+whole archive. Both come from the corpus cache (orgcorpus.py), so a warm
+run only stats the files.
+
+Usage:
+    ./org2json.py digests/2025/12/05-0900.org            # digest JSON to stdout
+    ./org2json.py digests/2025/12/05-0900.org -o d.json
+    ./org2json.py --index                                # digests.json + digests.org
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+import timings
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+
+TOPIC_COUNT = 3
+TOPIC_LEN = 30
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _id_order(sid: str) -> tuple:
+    """Sort key for story ids: numeric ids by value, anything malformed after them."""
+    return (sid.isdigit(), int(sid) if sid.isdigit() else 0, sid)
+
+
+def digest_json(digest: orgcorpus.Digest) -> dict:
+    """A parsed digest in the curator's /tmp/digest.json shape."""
+    stories = []
+    for s in digest.stories:
+        p = s.props
+        stories.append({
+            "id": _int(s.id),
+            "title": s.title,
+            "url": p.get("URL", ""),
+            "hn_url": p.get("HN_URL", ""),
+            "points": _int(p.get("POINTS", 0)),
+            "comments_count": _int(p.get("COMMENTS", 0)),
+            "by": p.get("BY", ""),
+            "tldr": s.tldr,
+            "take": s.take,
+            "tags": s.tags,
+            "comments": [{"by": c.by, "text": c.text, "id": _int(c.id)} for c in s.comments],
+            "i18n": s.i18n,
+        })
+    return {"date": digest.date, "vibe": digest.vibe, "highlights": digest.highlights,
+            "stories": stories}
+
+
+def index_entries(heads: list) -> list:
+    entries = []
+    for key, h in sorted(heads, key=lambda kh: (kh[1]["date"], kh[0]), reverse=True):
+        entries.append({
+            "path": key,
+            "date": h["when"][:10],
+            "time": h["when"][11:],
+            "story_ids": [s[0] for s in h["stories"]],
+            "topics": [s[1][:TOPIC_LEN] for s in h["stories"][:TOPIC_COUNT]],
+        })
+    return entries
+
+
+def index_json(entries: list) -> str:
+    ids = sorted({i for e in entries for i in e["story_ids"]}, key=_id_order, reverse=True)
+    return json.dumps({
+        "generated": datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z",
+        "digests": entries,
+        "story_ids": ids,
+        "total_digests": len(entries),
+        "total_stories": len(ids),
+    }, indent=2)
+
+
+def index_org(entries: list) -> str:
+    ids = {i for e in entries for i in e["story_ids"]}
+    out = ["#+TITLE: HN Digest Index", "#+STARTUP: overview", "",
+           "AI-curated Hacker News digests. Story IDs for dedup.", "",
+           f"Total: {len(entries)} digests, {len(ids)} unique stories", ""]
+    year = month = day = None
+    for e in entries:
+        d = date.fromisoformat(e["date"])
+        if d.year != year:
+            year, month = d.year, None
+            out.append(f"* {d.year}")
+        if d.month != month:
+            month, day = d.month, None
+            out.append(f"** {d:%B}")
+        if d != day:
+            day = d
+            out.append(f"*** {d:%d} ({d:%a})")
+        out.append(f"- [[file:{e['path']}][{e['time']}]] {', '.join(e['topics'])} | "
+                   f"{', '.join(e['story_ids'])}")
+    return "\n".join(out) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert org digests to JSON")
+    parser.add_argument("files", nargs="*", help="org digest(s) to convert")
+    parser.add_argument("-o", "--output", type=Path, help="write digest JSON here instead of stdout")
+    parser.add_argument("--index", action="store_true", help="rewrite digests.json and digests.org")
+    parser.add_argument("--digests", type=Path, default=orgcorpus.DIGESTS_DIR, help="digests dir for --index")
+    parser.add_argument("--out-dir", type=Path, default=REPO_ROOT, help="where --index writes (default: repo root)")
+    parser.add_argument("--cache-dir", type=Path, default=orgcorpus.CACHE_DIR, help="corpus cache dir")
+    args = parser.parse_args()
+    if not args.index and not args.files:
+        parser.error("give org files or --index")
+
+    t = perf_counter()
+    if args.index:
+        corpus, keys = orgcorpus.load(orgcorpus.digest_files(args.digests), args.cache_dir)
+        entries = index_entries(corpus.heads(keys))
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+        (args.out_dir / "digests.json").write_text(index_json(entries), encoding="utf-8")
+        (args.out_dir / "digests.org").write_text(index_org(entries), encoding="utf-8")
+        print(f"{args.out_dir}/digests.{{json,org}}: {len(entries)} digests "
+              f"({corpus.rescanned} parsed, {(perf_counter() - t) * 1000:.0f}ms)")
+        return
+
+    corpus, keys = orgcorpus.load(args.files, args.cache_dir)
+    docs = [digest_json(corpus.digest(k)) for k in keys]
+    text = json.dumps(docs[0] if len(docs) == 1 else docs, ensure_ascii=False, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    with timings.span("org2json"):
+        main()
@@ -0,0 +1,410 @@
+"""
+One parser and one record cache for the whole digest corpus.
+
+Every generator (llms-gen.py, org2json.py, org2html.py, historian.py) reads
+digests through here instead of parsing org files itself:
+
+    corpus = Corpus()
+    corpus.update(files)          # stat every file, re-parse only changed ones
+    for path, head in corpus.heads(): ...      # cheap: date, vibe, highlights, ids
+    digest = corpus.digest(path)               # full parsed Digest, from the cache
+    corpus.save()
+
+Cache layout (.cache/corpus/):
+    manifest.json   {version, files: {path: {stat, sha1, offset, length, head}}}
+    records.jsonl   one full Digest record per line, addressed by offset/length
+
+A file is re-read only when its (size, mtime_ns) changed, and re-parsed
+only when its sha1 changed too. Parsing streams lines out of an mmap in a
+single pass. Unchanged records are copied byte-for-byte when records.jsonl
+is rewritten, never decoded.
+
+Handles the org subset in docs/org-architecture.md (meta lines, Vibe,
+Highlights, story headings with tags and :PROPERTIES:, TLDR/Take, Comments,
+the i18n subtree), plus legacy .md digests. The digest time always comes
+from #+DATE (or the file name), never #+TITLE, which reads
+"2026-02-01 06:00:00 UT UTC" in most files. Story tags may contain - + #.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+DIGESTS_DIR = REPO_ROOT / "digests"
+CACHE_DIR = REPO_ROOT / ".cache" / "corpus"
+
+# bump when parse_org()/parse_md() output changes
+PARSER_VERSION = 2
+
+HEADING_RE = re.compile(r"^(\*+)\s+(.*?)\s*$")
+META_RE = re.compile(r"^#\+(\w+):\s*(.*?)\s*$")
+PROP_RE = re.compile(r"^:(\w+):\s*(.*?)\s*$")
+# tags are any non-space run between colons: :open-source:c++:c#: all occur
+STORY_HEADING_RE = re.compile(r"^(.+?)(?:\s+(:(?:[^\s:]+:)+))?\s*$")
+PATH_STAMP_RE = re.compile(r"(\d{4})/(\d\d)/(\d\d)-(\d\d)(\d\d)\.\w+$")
+
+MD_STORY_RE = re.compile(r"^#{2,3}\s+(?:\d+\.\s*)?(.*?)\s*$")
+MD_LINK_RE = re.compile(r"^\[(.*)\]\((\S+)\)$")
+MD_ITEM_RE = re.compile(r"item\?id=(\d+)")
+MD_POINTS_RE = re.compile(r"(\d+)\s*(?:points|pts)\b")
+MD_COMMENTS_RE = re.compile(r"(\d+)\s*comments\b")
+
+
+@dataclass
+class Comment:
+    by: str
+    id: str = ""
+    text: str = ""
+    props: dict = field(default_factory=dict)
+
+
+@dataclass
+class Story:
+    id: str = ""
+    title: str = ""
+    tags: list = field(default_factory=list)
+    props: dict = field(default_factory=dict)
+    tldr: str = ""
+    take: str = ""
+    comments: list = field(default_factory=list)
+    i18n: dict = field(default_factory=dict)  # lang -> {title, tldr, take, comments}
+
+
+@dataclass
+class Digest:
+    path: str
+    meta: dict = field(default_factory=dict)
+    vibe: str = ""
+    highlights: list = field(default_factory=list)
+    stories: list = field(default_factory=list)
+
+    @property
+    def date(self) -> str:
+        return self.meta.get("DATE", "")
+
+    @property
+    def stamp(self) -> str:
+        """MMDDHHMM suffix shared by every story anchor in this digest."""
+        d = self.date
+        return d[5:7] + d[8:10] + d[11:13] + d[14:16]
+
+    def to_record(self) -> dict:
+        # hand-rolled asdict(): the generic one deep-copies and is ~10x slower
+        return {"path": self.path, "meta": self.meta, "vibe": self.vibe,
+                "highlights": self.highlights,
+                "stories": [{**vars(s), "comments": [vars(c) for c in s.comments]}
+                            for s in self.stories]}
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "Digest":
+        stories = [Story(**{**s, "comments": [Comment(**c) for c in s["comments"]]})
+                   for s in rec["stories"]]
+        return cls(rec["path"], rec["meta"], rec["vibe"], rec["highlights"], stories)
+
+
+def parse_org(lines, path: str) -> Digest:
+    """Parse the digest subset of org in one pass over `lines` (str iterable)."""
+    digest = Digest(path)
+    bodies = {}          # id(obj) -> {field: [lines]} collected while scanning
+    section = story = lang = None
+    sub = ""             # level-3 heading under the current story
+    body_lines = None    # list that body lines go into
+    props = None         # dict the next :PROPERTIES: drawer fills
+    in_drawer = False
+
+    def body(obj, key):
+        return bodies.setdefault(id(obj), {}).setdefault(key, [])
+
+    for raw in lines:
+        line = raw.strip()
+        if in_drawer:
+            if line == ":END:":
+                in_drawer, props = False, None
+            elif props is not None and (m := PROP_RE.match(line)):
+                props[m.group(1)] = m.group(2)
+            continue
+        if line == ":PROPERTIES:":
+            in_drawer = True
+            continue
+
+        m = HEADING_RE.match(raw)
+        if m:
+            level, title = len(m.group(1)), m.group(2)
+            body_lines = props = None
+            if level == 1:
+                section, story = title.lower(), None
+                if section in ("vibe", "highlights"):
+                    body_lines = body(digest, section)
+            elif level == 2 and section == "stories":
+                hm = STORY_HEADING_RE.match(title)
+                story = Story(title=hm.group(1),
+                              tags=[t for t in (hm.group(2) or "").split(":") if t])
+                digest.stories.append(story)
+                props, sub, lang = story.props, "", None
+            elif level == 3 and story is not None:
+                sub, lang = (title.split() or [""])[0].lower(), None
+                if sub in ("tldr", "take"):
+                    body_lines = body(story, sub)
+            elif level == 4 and story is not None and sub == "comments":
+                comment = Comment(by=title)
+                story.comments.append(comment)
+                props, body_lines = comment.props, body(comment, "text")
+            elif level == 4 and story is not None and sub == "i18n":
+                lang = title
+                story.i18n[lang] = {}
+            elif level == 5 and lang is not None:
+                body_lines = story.i18n[lang].setdefault(title.lower(), [])
+            continue
+
+        if section is None:
+            if m := META_RE.match(line):
+                digest.meta[m.group(1).upper()] = m.group(2)
+        elif body_lines is not None:
+            body_lines.append(line)
+
+    digest.vibe = _join(body(digest, "vibe"))
+    digest.highlights = _list_items(body(digest, "highlights"))
+    for story in digest.stories:
+        story.id = story.props.get("ID", "")
+        story.tldr = _join(body(story, "tldr"))
+        story.take = _join(body(story, "take"))
+        for c in story.comments:
+            c.id = c.props.get("COMMENT_ID", "")
+            c.text = _join(body(c, "text"))
+        for tr in story.i18n.values():
+            for key, value in tr.items():
+                tr[key] = _list_items(value) if key == "comments" else _join(value)
+    _default_date(digest)
+    return digest
+
+
+def parse_md(lines, path: str) -> Digest:
+    """Best-effort parse of the pre-org markdown digests: ids, titles, numbers."""
+    digest = Digest(path)
+    story = None
+    for raw in lines:
+        line = raw.strip()
+        m = MD_STORY_RE.match(line)
+        if m and not line.startswith("## Vibe"):
+            title = m.group(1)
+            link = MD_LINK_RE.match(title)
+            story = Story(title=link.group(1) if link else title)
+            if link:
+                story.props["URL"] = link.group(2)
+            digest.stories.append(story)
+            continue
+        if story is None:
+            if line.startswith("# "):
+                digest.meta.setdefault("TITLE", line[2:])
+            elif line and not line.startswith(("#", "---")) and not digest.vibe:
+                digest.vibe = line.lstrip("> *_")
+            continue
+        if not story.id and (m := MD_ITEM_RE.search(line)):
+            story.id = m.group(1)
+            story.props["ID"] = story.id
+            story.props["HN_URL"] = f"https://news.ycombinator.com/item?id={story.id}"
+        if "POINTS" not in story.props and (m := MD_POINTS_RE.search(line)):
+            story.props["POINTS"] = m.group(1)
+        if "COMMENTS" not in story.props and (m := MD_COMMENTS_RE.search(line)):
+            story.props["COMMENTS"] = m.group(1)
+    digest.stories = [s for s in digest.stories if s.id]
+    _default_date(digest)
+    return digest
+
+
+def _default_date(digest: Digest):
+    if not digest.meta.get("DATE"):
+        m = PATH_STAMP_RE.search(digest.path)
+        if m:
+            digest.meta["DATE"] = f"{m[1]}-{m[2]}-{m[3]}T{m[4]}:{m[5]}:00Z"
+
+
+def _join(lines: list) -> str:
+    return " ".join(line for line in lines if line)
+
+
+def _list_items(lines: list) -> list:
+    items = []
+    for line in lines:
+        s = line.strip()
+        if s.startswith("- "):
+            items.append(s[2:].strip())
+        elif s and items:
+            items[-1] += " " + s
+    return items
+
+
+def _mmap_lines(mm):
+    """Lines of a mapped file, decoded in one go (per-line readline() is 10x slower)."""
+    return iter(str(mm, "utf-8", "replace").splitlines())
+
+
+def parse_file(path: str, key: str = None, known_sha1: str = None) -> tuple:
+    """(Digest, sha1) for one file, read through mmap in a single pass.
+
+    Digest is None when the content hash equals `known_sha1`.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            sha1 = hashlib.sha1(b"").hexdigest()
+            return (None if sha1 == known_sha1 else _parse([], key or path)), sha1
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            sha1 = hashlib.sha1(mm).hexdigest()
+            if sha1 == known_sha1:
+                return None, sha1
+            return _parse(_mmap_lines(mm), key or path), sha1
+
+
+def _parse(lines, path: str) -> Digest:
+    return parse_md(lines, path) if path.endswith(".md") else parse_org(lines, path)
+
+
+def head(digest: Digest) -> dict:
+    """The few fields the index generators and the historian need."""
+    d = digest.date
+    return {
+        "date": d,
+        "when": f"{d[:10]} {d[11:16]}",
+        "vibe": digest.vibe,
+        "highlights": digest.highlights,
+        "stories": [[s.id, s.title, _int(s.props.get("POINTS")), _int(s.props.get("COMMENTS"))]
+                    for s in digest.stories],
+    }
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def digest_files(digests_dir: Path = DIGESTS_DIR) -> list:
+    """Every digest under digests/YYYY/MM/, .org and legacy .md alike."""
+    return sorted(str(f) for f in digests_dir.glob("*/*/*") if f.suffix in (".org", ".md"))
+
+
+_ROOT_PREFIX = os.path.abspath(REPO_ROOT) + os.sep
+
+
+def corpus_key(path) -> str:
+    """Cache key for a digest file: repo-relative posix path when possible."""
+    p = os.path.abspath(path)
+    if p.startswith(_ROOT_PREFIX):
+        p = p[len(_ROOT_PREFIX):]
+    return p.replace(os.sep, "/")
+
+
+class Corpus:
+    """Parsed digests on disk: a stat/sha1 manifest plus a JSONL record file."""
+
+    def __init__(self, root: Path = CACHE_DIR, enabled: bool = True):
+        self.root = root
+        self.files = {}
+        self.fresh = {}          # key -> record bytes parsed this run
+        self.opened = {}         # key -> path as the caller gave it
+        self.rescanned = self.rehashed = 0
+        self.changed = False
+        self._mm = None
+        if enabled:
+            try:
+                manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+                if manifest.get("version") == PARSER_VERSION and (root / "records.jsonl").exists():
+                    self.files = manifest.get("files", {})
+            except (OSError, ValueError):
+                pass
+
+    def update(self, paths: list) -> list:
+        """Bring the given files up to date; returns their keys in input order."""
+        keys = []
+        for path in paths:
+            key = corpus_key(path)
+            keys.append(key)
+            self.opened[key] = path
+            st = os.stat(path)
+            stat = [st.st_size, st.st_mtime_ns]
+            entry = self.files.get(key)
+            if entry and entry["stat"] == stat:
+                continue
+            digest, sha1 = parse_file(path, key, entry and entry["sha1"])
+            self.changed = True
+            if digest is None:
+                entry["stat"] = stat
+                self.rehashed += 1
+                continue
+            record = json.dumps(digest.to_record(), ensure_ascii=False, separators=(",", ":"))
+            self.fresh[key] = record.encode("utf-8")
+            self.files[key] = {"stat": stat, "sha1": sha1, "head": head(digest)}
+            self.rescanned += 1
+        for key in set(self.files) - set(keys):
+            if not os.path.exists(self.opened.get(key, REPO_ROOT / key)):
+                del self.files[key]
+                self.changed = True
+        return keys
+
+    def heads(self, keys: list = None) -> list:
+        """[(key, head)] for the given keys, or every known digest."""
+        keys = self.files if keys is None else keys
+        return [(k, self.files[k]["head"]) for k in keys]
+
+    def sha1(self, key: str) -> str:
+        return self.files[key]["sha1"]
+
+    def record(self, key: str) -> dict:
+        if key in self.fresh:
+            return json.loads(self.fresh[key])
+        entry = self.files[key]
+        mm = self._records()
+        return json.loads(mm[entry["offset"]:entry["offset"] + entry["length"]])
+
+    def digest(self, key: str) -> Digest:
+        return Digest.from_record(self.record(key))
+
+    def _records(self):
+        if self._mm is None:
+            with open(self.root / "records.jsonl", "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def save(self):
+        """Rewrite records.jsonl + manifest if anything changed since load."""
+        if not self.changed:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "records.jsonl.tmp"
+        offset = 0
+        with open(tmp, "wb") as out:
+            for key in sorted(self.files):
+                entry = self.files[key]
+                if key in self.fresh:
+                    data = self.fresh[key]
+                else:
+                    mm = self._records()
+                    data = mm[entry["offset"]:entry["offset"] + entry["length"]]
+                out.write(data + b"\n")
+                entry["offset"], entry["length"] = offset, len(data)
+                offset += len(data) + 1
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        tmp.replace(self.root / "records.jsonl")
+        self.fresh.clear()
+        tmp = self.root / "manifest.json.tmp"
+        tmp.write_text(json.dumps({"version": PARSER_VERSION, "files": self.files},
+                                  ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.root / "manifest.json")
+        self.changed = False
+
+
+def load(paths: list, root: Path = CACHE_DIR) -> tuple:
+    """(Corpus, keys): open the cache, update it for `paths`, save if changed."""
+    corpus = Corpus(root)
+    keys = corpus.update(paths)
+    corpus.save()
+    return corpus, keys
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+Static full-text search index for the digest archive.
+
+Every story appearance is one document: title, tags, TL;DR, take and
+comments, in English and in every translation. Latin-script text is split
+into words (lowercased, accents folded, a few stopwords dropped); zh/ja/ko
+runs become overlapping character bigrams, so a query needs no dictionary.
+The browser-side tokenizer in org2html.py does exactly the same, driven by
+the settings in meta.json.
+
+Layout (search/ next to index.html):
+    meta.json    tokenizer settings, doc count, shard boundaries
+    t/HASH.json  {term: postings} for one contiguous range of terms (~24KB),
+                 or, past DIR_FANOUT shards, a directory [[boundary, shard]]
+    d/N.json     [[anchor, title, when], ...] for DOC_CHUNK documents
+
+A query fetches meta.json, one shard (plus its directory, on a big
+archive) per term and segment, then the doc chunks of the top results,
+and nothing else. Postings are a compact string
+per term: delta-coded doc ids and a field weight, base-32 varints in
+URL-safe characters.
+
+Shards are content-addressed, so unchanged ones keep their file, and
+search/ is committed, so every rewritten shard stays in git history for
+good. The index is a list of segments, each covering a run of digests:
+sealed segments, oldest and biggest first, then the tail. Queries read
+every segment. Cadence:
+
+- a normal run rebuilds only the tail (the newest digests), so that is
+  what each commit pays for;
+- once the tail holds more than TAIL_DOCS stories (about ten digests),
+  it is sealed as it is: same postings, same shard files, nothing new;
+- the new segment then swallows older ones while they are at most
+  MERGE_RATIO times its size, so segments shrink by more than 4x from
+  one to the next. That keeps it to about log4(docs / TAIL_DOCS) + 2
+  segments, and a story's postings get rewritten O(log n) times over
+  the archive's life instead of at every fold;
+- an edited old digest rebuilds only from the segment holding it.
+
+Each segment's shards are sized by its share of the docs (SHARD_BYTES for
+the whole archive, SHARD_MIN at least), so the small newer segments add
+little to what a query downloads.
+
+Usage:
+    ./search-index.py                        # update search/ from digests/
+    ./search-index.py --rebuild              # rebuild everything as one segment
+    ./search-index.py -q "rust async"        # query the built index like the site does
+    ./search-index.py --bench 10000          # synthetic archive benchmark
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from operator import add
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+import synthetic
+import timings
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+OUT_DIR = REPO_ROOT / "search"
+
+# bump when terms(), the postings encoding or the file layout changes
+INDEX_VERSION = 2
+
+SHARD_BYTES = 24 * 1024
+SHARD_MIN = 4 * 1024
+DIR_FANOUT = 256
+DOC_CHUNK = 16
+TAIL_DOCS = 50
+MERGE_RATIO = 4
+MAX_TERM = 32
+RESULTS = 20
+
+FIELD_WEIGHTS = {"title": 5, "tags": 3, "tldr": 2, "take": 1, "comments": 1}
+
+# Hiragana, Katakana, CJK Ext-A, CJK Unified, Hangul syllables, CJK compatibility
+CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+
+# already accent-folded (see fold()): words are folded before they are checked
+STOPWORDS = frozenset("""
+a about after all also an and are as at be been but by can could did do does for from had
+has have he her his how i if in into is it its just more most my new no not of on one or
+our out over she so than that the their them then there these they this to up was we were
+what when which who will with would you your
+al como con de del el en es la las lo los para pero por que se su sus un una y
+aber als auch auf aus bei das dem den der des die ein eine einen fur ist im mit nicht noch
+oder sich sie und von wie zu zum zur
+""".split())
+
+CJK_RE = re.compile(f"[{CJK}]+")
+WORD_RE = re.compile(f"[^\W_{CJK}]+")
+MARKS_RE = re.compile("[\u0300-\u036f]")
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz-_"
+
+
+def fold(word: str) -> str:
+    """Drop accents: NFKD, then strip combining diacritical marks."""
+    return word if word.isascii() else MARKS_RE.sub("", unicodedata.normalize("NFKD", word))
+
+
+def terms(text: str) -> set:
+    """Distinct index terms of `text`: CJK bigrams plus folded words minus stopwords."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    out = set()
+    for run in CJK_RE.findall(text):
+        out.update(map(add, run, run[1:]) if len(run) > 1 else (run,))
+    words = set(WORD_RE.findall(text))
+    accented = [w for w in words if not w.isascii()]
+    if accented:
+        words.difference_update(accented)
+        words.update(map(fold, accented))
+    words -= STOPWORDS
+    if words and max(map(len, words)) > MAX_TERM:
+        words = {w for w in words if len(w) <= MAX_TERM}
+    out |= words
+    return out
+
+
+def story_texts(story: orgcorpus.Story) -> dict:
+    """weight -> every field of that weight, all languages, one field per line.
+
+    Tokenizing a handful of joined strings instead of ~30 small ones halves
+    the index time; the newlines keep CJK bigrams from spanning fields.
+    """
+    w = FIELD_WEIGHTS
+    fields = {w["title"]: [story.title], w["tags"]: [" ".join(story.tags)],
+              w["tldr"]: [story.tldr], w["take"]: [story.take]}
+    fields.setdefault(w["comments"], []).extend(c.text for c in story.comments)
+    for tr in story.i18n.values():
+        fields[w["title"]].append(tr.get("title", ""))
+        fields[w["tldr"]].append(tr.get("tldr", ""))
+        fields[w["take"]].append(tr.get("take", ""))
+        fields[w["comments"]].extend(tr.get("comments", []))
+    return {weight: "\n".join(texts) for weight, texts in fields.items()}
+
+
+def doc_terms(story: orgcorpus.Story) -> Counter:
+    """term -> sum of the weights of the fields it occurs in (at most 12)."""
+    weights = Counter()
+    for weight, text in story_texts(story).items():
+        found = terms(text)
+        for _ in range(weight):
+            weights.update(found)
+    return weights
+
+
+def varint(n: int) -> str:
+    """Base-32 digits, most significant first; every digit but the last has bit 5 set."""
+    out = DIGITS[n & 31]
+    n >>= 5
+    while n:
+        out = DIGITS[32 + (n & 31)] + out
+        n >>= 5
+    return out
+
+
+# encoded (delta, weight) for the common small deltas: one lookup per posting
+_PAIRS = [(varint(d) + DIGITS[w]).encode() for d in range(2048) for w in range(16)]
+
+
+def index_docs(digests, first: int = 0) -> tuple:
+    """(docs, postings) for an iterable of digests, doc ids numbered from `first`.
+
+    docs: [[anchor, title, when]]; postings: {term: [last doc id, encoded bytes]}.
+    """
+    docs, postings = [], {}
+    pairs = _PAIRS
+    for digest in digests:
+        stamp, when = digest.stamp, f"{digest.date[:10]} {digest.date[11:16]}"
+        for story in digest.stories:
+            doc = first + len(docs)
+            docs.append([f"s{story.id}-{stamp}", story.title, when])
+            for term, w in doc_terms(story).items():
+                p = postings.get(term)
+                if p is None:
+                    postings[term] = [doc, bytearray((varint(doc) + DIGITS[w]).encode())]
+                    continue
+                delta = doc - p[0]
+                p[0] = doc
+                p[1] += pairs[delta << 4 | w] if delta < 2048 else (varint(delta) + DIGITS[w]).encode()
+    return docs, postings
+
+
+def _key(term: str) -> bytes:
+    # the browser compares strings by UTF-16 code unit; sort the same way
+    return term.encode("utf-16-be")
+
+
+def _boundary(prev: str, first: str) -> str:
+    """Shortest prefix of `first` that still sorts after `prev`."""
+    prev_key = _key(prev)
+    for i in range(1, len(first)):
+        if _key(first[:i]) > prev_key:
+            return first[:i]
+    return first
+
+
+def shard_postings(postings: dict, limit: int = SHARD_BYTES) -> list:
+    """[(boundary, shard bytes)]: terms in sort order, cut every ~`limit` bytes."""
+    shards, parts, size, prev, start = [], [], 0, "", None
+    for term in sorted(postings, key=_key):
+        part = f'{json.dumps(term, ensure_ascii=False)}:"{postings[term][1].decode()}"'.encode()
+        if parts and size + len(part) > limit:
+            shards.append((start, b"{" + b",".join(parts) + b"}"))
+            parts, size, start = [], 0, None
+        if start is None:
+            start = _boundary(prev, term) if shards else ""
+        parts.append(part)
+        size += len(part) + 1
+        prev = term
+    if parts:
+        shards.append((start, b"{" + b",".join(parts) + b"}"))
+    return shards
+
+
+def _write(path: Path, data: bytes) -> bool:
+    """Write `data` unless the file already holds exactly that; True if written."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return True
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def merge_count(sizes: list) -> int:
+    """How many of the newest segments (doc counts, oldest first) to merge into one.
+
+    Sealing is free and every run rewrites the tail, so the tail stays small
+    (TAIL_DOCS) and merges are what keep the segment count down.
+    """
+    k, merged = 1, sizes[-1]
+    while k < len(sizes) and sizes[-k - 1] <= MERGE_RATIO * merged:
+        merged += sizes[-k - 1]
+        k += 1
+    return k
+
+
+def base_hash(entries: list) -> str:
+    """Identity of the digests a segment ends at: keys + content hashes of all up to it."""
+    return prefix_hashes(entries, [len(entries)])[0]
+
+
+def prefix_hashes(entries: list, ends: list) -> list:
+    """base_hash(entries[:end]) for each of the ascending `ends`, in one pass."""
+    h, out, done = hashlib.sha1(), [], 0
+    for end in ends:
+        for key, sha1 in entries[done:end]:
+            h.update(f"{key}\0{sha1}\n".encode())
+        done = end
+        out.append(h.hexdigest()[:16])
+    return out
+
+
+class SearchIndex:
+    """search/ on disk: build it for an ordered digest list, reusing every sealed segment that still fits.
+
+    `entries` is [(key, sha1)] oldest first; `load(key)` returns that Digest.
+    """
+
+    def __init__(self, out: Path = OUT_DIR):
+        self.out = out
+        self.written = self.written_bytes = self.removed = self.terms = self.merged = 0
+        self.sealed = False
+        self.timings = {}
+        try:
+            self.meta = json.loads((out / "meta.json").read_text(encoding="utf-8"))
+            if self.meta.get("version") != INDEX_VERSION:
+                self.meta = {}
+        except (OSError, ValueError):
+            self.meta = {}
+
+    def _sealed(self, entries: list) -> list:
+        """[(info, segment)] for the existing sealed segments still built from a prefix of `entries`.
+
+        Everything from the first segment whose digests changed (or whose
+        files are gone) on is dropped and gets rebuilt.
+        """
+        infos = [i for i in self.meta.get("sealed", []) if i["digests"] <= len(entries)]
+        hashes = prefix_hashes(entries, [i["digests"] for i in infos])
+        keep = []
+        for info, seg, h in zip(infos, self.meta.get("segments", []), hashes):
+            if h != info["hash"]:
+                break
+            try:
+                if not all(os.path.exists(self.out / f) for f in self._files(seg)):
+                    break
+            except OSError:
+                break
+            keep.append((info, seg))
+        # the doc chunk straddling the last kept segment's end is read back by _write_docs
+        while keep and keep[-1][0]["docs"] % DOC_CHUNK and \
+                not os.path.exists(self.out / f"d/{keep[-1][0]['docs'] // DOC_CHUNK}.json"):
+            keep.pop()
+        return keep
+
+    def build(self, entries: list, load, rebuild: bool = False) -> dict:
+        t = perf_counter()
+        sealed = [] if rebuild else self._sealed(entries)
+        start = sealed[-1][0] if sealed else {"digests": 0, "docs": 0}
+        docs, postings = index_docs((load(k) for k, _ in entries[start["digests"]:]), start["docs"])
+        self.sealed = bool(docs) and (not sealed or len(docs) > TAIL_DOCS)
+        if self.sealed:
+            ends = [0] + [info["docs"] for info, _ in sealed]
+            n = merge_count([b - a for a, b in zip(ends, ends[1:])] + [len(docs)])
+            if n > 1:
+                sealed = sealed[:len(sealed) - (n - 1)]
+                start = sealed[-1][0] if sealed else {"digests": 0, "docs": 0}
+                docs, postings = index_docs((load(k) for k, _ in entries[start["digests"]:]), start["docs"])
+                self.merged = n - 1
+        self.timings["index"] = perf_counter() - t
+        self.terms = len(postings)
+
+        t = perf_counter()
+        total = self._write_docs(start["docs"], docs)
+        tail = self._write_segment(postings, len(docs) / max(total, 1))
+        if self.sealed:
+            sealed.append(({"digests": len(entries), "hash": base_hash(entries), "docs": total}, tail))
+            tail = []
+        segments = [seg for _, seg in sealed] + [tail]
+        meta = {
+            "version": INDEX_VERSION,
+            "docs": total,
+            "chunk": DOC_CHUNK,
+            "results": RESULTS,
+            "cjk": CJK,
+            "maxterm": MAX_TERM,
+            "stop": sorted(STOPWORDS),
+            "sealed": [info for info, _ in sealed],
+            "segments": segments,
+        }
+        self._save("meta.json", _dumps(meta))
+        self.meta = meta
+        live = {name for seg in segments for name in self._files(seg)}
+        live.update(f"d/{n}.json" for n in range(-(-total // DOC_CHUNK)))
+        for sub in ("t", "d"):
+            for f in (self.out / sub).glob("*.json"):
+                if f"{sub}/{f.name}" not in live:
+                    f.unlink()
+                    self.removed += 1
+        self.timings["write"] = perf_counter() - t
+        return meta
+
+    def _save(self, name: str, data: bytes):
+        if _write(self.out / name, data):
+            self.written += 1
+            self.written_bytes += len(data)
+
+    def _write_segment(self, postings: dict, share: float) -> list:
+        """[[boundary, file]] for one segment's shards, grouped into directories if many.
+
+        A query reads one shard per term from every segment, so shards are
+        sized by the segment's `share` of all docs: small segments cost little.
+        """
+        limit = max(SHARD_MIN, int(SHARD_BYTES * share))
+        entries = [[boundary, self._put(data)] for boundary, data in shard_postings(postings, limit)]
+        if len(entries) > DIR_FANOUT:
+            entries = [[entries[i][0], self._put(_dumps(entries[i:i + DIR_FANOUT]))]
+                       for i in range(0, len(entries), DIR_FANOUT)]
+        return entries
+
+    def _put(self, data: bytes) -> str:
+        name = f"t/{hashlib.sha1(data).hexdigest()[:12]}.json"
+        if not os.path.exists(self.out / name):
+            self._save(name, data)
+        return name
+
+    def _files(self, entries: list):
+        """Every file a segment uses: its entries and, for directories, their shards."""
+        for _, name in entries:
+            yield name
+            with open(self.out / name, "rb") as f:
+                is_dir = f.read(1) == b"["
+            if is_dir:
+                yield from self._files(json.loads((self.out / name).read_bytes()))
+
+    def _write_docs(self, first: int, docs: list) -> int:
+        """Write the doc chunks from doc `first` on; returns the total doc count.
+
+        Ids are oldest-first, so a tail rebuild only rewrites the last few chunks
+        and a merge rewrites none (same docs, same ids, same bytes).
+        A chunk shared with an older segment keeps its docs from the current file.
+        """
+        lo = first - first % DOC_CHUNK
+        if lo < first:
+            old = json.loads((self.out / f"d/{lo // DOC_CHUNK}.json").read_bytes())
+            docs = old[:first - lo] + docs
+        for i in range(0, len(docs), DOC_CHUNK):
+            self._save(f"d/{(lo + i) // DOC_CHUNK}.json", _dumps(docs[i:i + DOC_CHUNK]))
+        return lo + len(docs)
+
+
+_VALUE = {c: i for i, c in enumerate(DIGITS)}
+
+
+def decode(code: str) -> list:
+    """[(doc id, weight)] from one term's postings string."""
+    out, doc, n, i = [], 0, 0, 0
+    while i < len(code):
+        c = _VALUE[code[i]]
+        i += 1
+        n = n * 32 + (c & 31)
+        if c < 32:
+            doc += n
+            out.append((doc, _VALUE[code[i]]))
+            n, i = 0, i + 1
+    return out
+
+
+class Searcher:
+    """Answer queries from search/ the way the site's script does, counting bytes read."""
+
+    def __init__(self, root: Path = OUT_DIR):
+        self.root = root
+        self.fetched = {}        # file -> bytes, each file counted once like a browser cache
+        self.meta = self._get("meta.json")
+
+    def _get(self, name: str):
+        data = (self.root / name).read_bytes()
+        self.fetched[name] = len(data)
+        return json.loads(data)
+
+    def _shards(self, entries: list, lo: str, hi: str) -> list:
+        """Shards whose term ranges meet [lo, hi], descending through directories."""
+        keys = [_key(b) for b, _ in entries]
+        found = []
+        for _, name in entries[max(bisect_right(keys, _key(lo)) - 1, 0):bisect_right(keys, _key(hi))]:
+            data = self._get(name)
+            found.extend(self._shards(data, lo, hi) if isinstance(data, list) else [data])
+        return found
+
+    def postings(self, term: str) -> dict:
+        """doc -> weight; a lone CJK character matches every bigram it starts."""
+        prefix = len(term) == 1 and CJK_RE.match(term) is not None
+        docs = {}
+        for seg in self.meta["segments"]:
+            for shard in self._shards(seg, term, term + "\uffff" if prefix else term):
+                codes = [c for t, c in shard.items() if t.startswith(term)] if prefix else [shard.get(term)]
+                for code in filter(None, codes):
+                    for doc, w in decode(code):
+                        docs[doc] = max(docs.get(doc, 0), w)
+        return docs
+
+    def search(self, query: str, limit: int = RESULTS) -> list:
+        """[[anchor, title, when, score]], best first: all terms if any doc has them, else any."""
+        lists = [self.postings(t) for t in sorted(terms(query))]
+        total, scores = self.meta["docs"], {}
+        for p in lists:
+            if p:
+                idf = math.log(1 + total / len(p))
+                for doc, w in p.items():
+                    scores[doc] = scores.get(doc, 0) + w * idf
+        hits = [d for d in scores if all(d in p for p in lists)] or list(scores)
+        hits.sort(key=lambda d: (-scores[d], -d))
+        chunk = self.meta["chunk"]
+        return [[*self._get(f"d/{d // chunk}.json")[d % chunk], round(scores[d], 2)]
+                for d in hits[:limit]]
+
+
+BENCH_QUERIES = (("en", 1), ("en", 2), ("es", 2), ("de", 1), ("zh", 2), ("ja", 4), ("ko", 1))
+
+
+def bench(count: int, seed: int, queries: int):
+    """Build an index for a synthetic archive in a temp dir and report size, time, bytes per query."""
+    out = Path(tempfile.mkdtemp(prefix="search-bench-"))
+    try:
+        keys = [f"digests/{synthetic.stamp(n):%Y/%m/%d-%H%M}.org" for n in range(count + 1)]
+        entries = [(k, "") for k in keys]
+        order = {k: n for n, k in enumerate(keys)}
+        stream, generating = {"digests": synthetic.digests(count + 1, seed), "next": 0}, [0.0]
+
+        def load(key):
+            t = perf_counter()
+            n = order[key]
+            if n < stream["next"]:
+                # a merge re-reads older digests; the generator only runs forward
+                stream.update(digests=synthetic.digests(count + 1, seed), next=0)
+            for _ in range(n - stream["next"]):
+                next(stream["digests"])
+            digest = next(stream["digests"])
+            stream["next"] = n + 1
+            generating[0] += perf_counter() - t
+            return digest
+
+        index = SearchIndex(out)
+        meta = index.build(entries[:count], load)
+        build = index.timings["index"] - generating[0]
+        chunks = -(-meta["docs"] // DOC_CHUNK)
+        shard_files = [(out / name).stat().st_size for seg in meta["segments"] for name in index._files(seg)]
+        doc_bytes = sum(f.stat().st_size for f in (out / "d").glob("*.json"))
+        meta_raw = (out / "meta.json").read_bytes()
+        print(f"synthetic archive: {count:,} digests, {meta['docs']:,} stories, seed {seed} "
+              f"(generated in {generating[0]:.1f}s, not counted below)")
+        print(f"full build: {build:.1f}s tokenize+index, {index.timings['write']:.1f}s write, "
+              f"{index.terms:,} terms")
+        print(f"index: {len(shard_files):,} term shards + directories {sum(shard_files):,} bytes, {chunks} doc chunks "
+              f"{doc_bytes:,} bytes, meta.json {len(meta_raw):,} bytes "
+              f"({len(gzip.compress(meta_raw)):,} gzipped)")
+
+        index, t = SearchIndex(out), perf_counter()
+        index.build(entries, load)
+        print(f"append 1 digest: {perf_counter() - t:.2f}s, "
+              f"{index.written} files written ({index.written_bytes:,} bytes), {index.removed} removed")
+
+        rng = random.Random(seed)
+        print(f"bytes fetched per query, cold cache, meta.json included ({queries} queries per kind):")
+        for lang, words in BENCH_QUERIES:
+            raw, packed, hits = [], [], []
+            for _ in range(queries):
+                s = Searcher(out)
+                hits.append(len(s.search(synthetic.text(rng, lang, words))))
+                raw.append(sum(s.fetched.values()))
+                packed.append(sum(len(gzip.compress((out / f).read_bytes())) for f in s.fetched))
+            raw.sort()
+            print(f"  {lang} x{words}: median {statistics.median(raw):>10,.0f}  "
+                  f"p95 {raw[int(len(raw) * 0.95) - 1]:>10,}  max {raw[-1]:>10,}  "
+                  f"gzip median {statistics.median(packed):>9,.0f}  "
+                  f"hits median {statistics.median(hits):.0f}")
+    finally:
+        shutil.rmtree(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static full-text search index")
+    parser.add_argument("-o", "--out", type=Path, default=OUT_DIR, help="index dir (default: search/)")
+    parser.add_argument("--digests", type=Path, default=orgcorpus.DIGESTS_DIR, help="digests dir")
+    parser.add_argument("--cache-dir", type=Path, default=orgcorpus.CACHE_DIR, help="corpus cache dir")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild everything as one sealed segment")
+    parser.add_argument("-q", "--query", help="search the built index and print the results")
+    parser.add_argument("--bench", type=int, metavar="N", help="benchmark on N synthetic digests")
+    parser.add_argument("--seed", type=int, default=1, help="synthetic archive seed (default: 1)")
+    parser.add_argument("--queries", type=int, default=50, help="benchmark queries per kind (default: 50)")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench, args.seed, args.queries)
+        return
+    if args.query is not None:
+        try:
+            searcher = Searcher(args.out)
+        except OSError as e:
+            print(f"error: no index: {e}", file=sys.stderr)
+            sys.exit(1)
+        for anchor, title, when, score in searcher.search(args.query):
+            print(f"{score:8.2f}  {when}  #{anchor}  {title}")
+        print(f"{sum(searcher.fetched.values()):,} bytes from {len(searcher.fetched)} files")
+        return
+
+    t = perf_counter()
+    corpus, keys = orgcorpus.load(orgcorpus.digest_files(args.digests), args.cache_dir)
+    heads = sorted(corpus.heads(keys), key=lambda kh: (kh[1]["date"], kh[0]))
+    index = SearchIndex(args.out)
+    meta = index.build([(k, corpus.sha1(k)) for k, _ in heads], corpus.digest, args.rebuild)
+    ends = [0] + [info["docs"] for info in meta["sealed"]]
+    sizes = " + ".join(str(b - a) for a, b in zip(ends, ends[1:])) or "0"
+    if index.sealed:
+        mode = f"segments {sizes}, tail sealed" + (f" and merged with {index.merged}" if index.merged else "")
+    else:
+        mode = f"segments {sizes} + tail {meta['docs'] - ends[-1]}"
+    print(f"{args.out}/: {meta['docs']} docs, {mode}; {index.written} files written "
+          f"({index.written_bytes:,} bytes), {index.removed} removed ({(perf_counter() - t) * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    with timings.span("search-index"):
+        main()
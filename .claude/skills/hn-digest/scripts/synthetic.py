@@ -0,0 +1,196 @@
+"""
+Seeded synthetic digest archive, for benchmarks.
+
+Shapes follow the real corpus: five digests a day, five stories each,
+three comments per story, tags, and all five translations. Text lengths
+match the real averages per language (about 1000 characters of English per
+story, 300-400 of zh/ja/ko, 900 of es/de). Words are drawn Zipf-style from
+a fixed vocabulary per language, so index sizes and posting-list lengths
+behave like natural text rather than uniform noise. About one story in
+seven revisits an earlier id.
+
+    for digest in synthetic.digests(10_000, seed=1): ...
+    synthetic.write_archive(Path("/tmp/bench/digests"), 10_000, seed=1)
+
+write_archive() renders the same digests as org files in the layout
+the real archive uses (digests/YYYY/MM/DD-HHMM.org, i18n subtrees
+included), so the generator scripts can be run against it unchanged.
+
+Same count and seed give the same archive on every machine.
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+from orgcorpus import Comment, Digest, Story
+
+START = datetime(2020, 1, 1, 1, 0)
+DIGEST_HOURS = (1, 6, 11, 16, 21)
+STORIES = 5
+COMMENTS = 3
+REVISIT_RATE = 0.15
+FIRST_ID = 40_000_000
+
+LANGS = ("zh", "ja", "ko", "es", "de")
+SPACED = {"en", "es", "de", "ko"}
+
+# (title, tldr, take, comment) words per field; CJK counts are characters
+LENGTHS = {
+    "en": (9, 45, 30, 45),
+    "es": (10, 50, 32, 35),
+    "de": (9, 45, 30, 35),
+    "ko": (20, 90, 60, 80),
+    "ja": (22, 85, 55, 70),
+    "zh": (16, 65, 45, 50),
+}
+
+SYLLABLES = {
+    "en": "ba be bi bo bu ca co cu da de di do fa fe fi fo ga go ha he hi ho ja ka ke ki ko "
+          "la le li lo lu ma me mi mo mu na ne ni no nu pa pe pi po ra re ri ro ru sa se si "
+          "so su ta te ti to tu va ve vi wa we wi xo ya yo za ze st tr pl ck ng th sh",
+    "es": "la le lo li da de do di ca co ce ci ra re ro ri ta te to ti na ne no ni ma me mo "
+          "mi pa pe po pi sa se so si ga go gu ll ñe ción mente dad ar er ir es os as",
+    "de": "ge be ver ein aus an ung keit lich sch ach ich er en el ra re ri ro ta te ti to "
+          "ma me mi mo na ne ni no ha he hi ho st sp zu zw ä ö ü ß ber dor fel gen",
+}
+
+POOL = 1 << 18
+
+_vocab = {}
+_pools = {}
+
+
+def _vocabulary(lang: str, size: int = 20000) -> tuple:
+    """(words, cumulative Zipf weights) for one language, built once per process."""
+    if lang in _vocab:
+        return _vocab[lang]
+    rng = random.Random(f"vocab-{lang}")
+    if lang in SYLLABLES:
+        syl = SYLLABLES[lang].split()
+        words = {"".join(rng.choices(syl, k=rng.choice((1, 2, 2, 3, 3, 4)))) for _ in range(size * 2)}
+        words = sorted(words)[:size]
+    elif lang == "ko":
+        words = sorted({"".join(chr(0xAC00 + rng.randrange(2350)) for _ in range(rng.choice((1, 2, 2, 3))))
+                        for _ in range(size)})
+    elif lang == "ja":
+        kana = [chr(c) for c in range(0x3041, 0x3097)] + [chr(c) for c in range(0x30A1, 0x30FB)]
+        kanji = [chr(0x4E00 + rng.randrange(3000)) for _ in range(2000)]
+        words = sorted(set(kana + kanji))
+    else:
+        words = sorted({chr(0x4E00 + rng.randrange(3500)) for _ in range(3000)})
+    rng.shuffle(words)
+    weights = list(accumulate(1.0 / (rank + 1) for rank in range(len(words))))
+    _vocab[lang] = (words, weights)
+    return words, weights
+
+
+def _pool(lang: str) -> list:
+    """A fixed Zipf-distributed word stream per language; texts are slices of it.
+
+    Drawing every word separately dominated generation time (a bisect per
+    word); slicing keeps the same term distribution at a fraction of the cost.
+    """
+    if lang not in _pools:
+        words, weights = _vocabulary(lang)
+        _pools[lang] = random.Random(f"pool-{lang}").choices(words, cum_weights=weights, k=POOL)
+    return _pools[lang]
+
+
+def text(rng: random.Random, lang: str, n: int) -> str:
+    pool = _pool(lang)
+    k = max(1, int(rng.gauss(n, n / 4)))
+    i = rng.randrange(POOL - k)
+    return (" " if lang in SPACED else "").join(pool[i:i + k])
+
+
+def _tags(rng: random.Random) -> list:
+    words, weights = _vocabulary("en")
+    return list(dict.fromkeys(rng.choices(words[:300], cum_weights=weights[:300], k=rng.randint(1, 4))))
+
+
+def _story(rng: random.Random, sid: int) -> Story:
+    title, tldr, take, comment = LENGTHS["en"]
+    story = Story(
+        id=str(sid),
+        title=text(rng, "en", title).capitalize(),
+        tags=_tags(rng),
+        props={"ID": str(sid), "URL": f"https://example.com/{sid}",
+               "HN_URL": f"https://news.ycombinator.com/item?id={sid}",
+               "POINTS": str(rng.randint(50, 2000)), "COMMENTS": str(rng.randint(10, 900)),
+               "BY": text(rng, "en", 1)},
+        tldr=text(rng, "en", tldr),
+        take=text(rng, "en", take),
+        comments=[Comment(by=text(rng, "en", 1), id=str(sid + i + 1), text=text(rng, "en", comment),
+                          props={"COMMENT_ID": str(sid + i + 1)})
+                  for i in range(COMMENTS)],
+    )
+    for lang in LANGS:
+        title, tldr, take, comment = LENGTHS[lang]
+        story.i18n[lang] = {"title": text(rng, lang, title), "tldr": text(rng, lang, tldr),
+                            "take": text(rng, lang, take),
+                            "comments": [text(rng, lang, comment) for _ in range(COMMENTS)]}
+    return story
+
+
+def stamp(n: int) -> datetime:
+    """Publication time of the n-th synthetic digest."""
+    day, slot = divmod(n, len(DIGEST_HOURS))
+    return START + timedelta(days=day, hours=DIGEST_HOURS[slot] - START.hour)
+
+
+def digests(count: int, seed: int = 0):
+    """Yield `count` Digest objects, oldest first."""
+    rng = random.Random(seed)
+    next_id, seen = FIRST_ID, []
+    for n in range(count):
+        when = stamp(n)
+        stories = []
+        for _ in range(STORIES):
+            if seen and rng.random() < REVISIT_RATE:
+                sid = rng.choice(seen[-500:])
+            else:
+                next_id += rng.randint(5, 400)
+                sid = next_id
+                seen.append(sid)
+            stories.append(_story(rng, sid))
+        d = Digest(path=f"digests/{when:%Y/%m/%d-%H%M}.org",
+                   meta={"TITLE": f"HN Digest {when:%Y-%m-%d %H:%M}", "DATE": f"{when:%Y-%m-%dT%H:%M:00Z}",
+                         "CURATOR": "synthetic"},
+                   vibe=text(rng, "en", 20), stories=stories)
+        d.highlights = [f"{s.title.split()[0]}: {text(rng, 'en', 8)}" for s in stories[:3]]
+        yield d
+
+
+def _props(props: dict) -> list:
+    return [":PROPERTIES:"] + [f"{':' + k + ':':<10} {v}" for k, v in props.items()] + [":END:"]
+
+
+def to_org(digest: Digest) -> str:
+    """A digest as the org text the curator's digests are written in."""
+    out = [f"#+{k}: {v}" for k, v in digest.meta.items()]
+    out += ["", "* Vibe", digest.vibe, "", "* Highlights"] + [f"- {h}" for h in digest.highlights]
+    out += ["", "* Stories"]
+    for s in digest.stories:
+        out += ["", f"** {s.title} :{':'.join(s.tags)}:"] + _props(s.props)
+        out += ["", "*** TLDR", s.tldr, "", "*** Take", s.take, "", "*** Comments"]
+        for c in s.comments:
+            out += ["", f"**** {c.by}"] + _props(c.props) + [c.text]
+        out += ["", f"*** i18n{' ' * 50}:i18n:", ""]
+        for lang, tr in s.i18n.items():
+            out += [f"**** {lang}"] + _props({"LANG": lang})
+            out += ["***** Title", tr["title"], "***** TLDR", tr["tldr"], "***** Take", tr["take"],
+                    "***** Comments"] + [f"- {c}" for c in tr["comments"]]
+    return "\n".join(out) + "\n"
+
+
+def write_archive(root: Path, count: int, seed: int = 0) -> list:
+    """Write `count` digests under root/YYYY/MM/DD-HHMM.org; returns their paths, oldest first."""
+    paths = []
+    for digest in digests(count, seed):
+        path = root / digest.path.removeprefix("digests/")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(to_org(digest), encoding="utf-8")
+        paths.append(path)
+    return paths
@@ -0,0 +1,73 @@
+"""
+articles.py against a local server: extracts shared between URLs that
+return the same body keep their own URL.
+
+    python3 -m unittest discover -s .claude/skills/hn-digest/scripts/tests
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import articles  # noqa: E402
+from asynchttp import Pool  # noqa: E402
+
+# the same cookie wall in front of two different stories
+WALL = b"<html><head><title>Before you continue</title></head><body><p>" + b"accept cookies " * 40 + b"</p></body></html>"
+
+
+async def serve(reader, writer):
+    request = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    path = request.split()[1].decode()
+    if path.startswith("/r/"):
+        head, body = b"HTTP/1.1 302 Found\r\nLocation: /a/" + path[3:].encode() + b"\r\n", b""
+    else:
+        head, body = b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n", WALL
+    writer.write(head + b"Connection: close\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+    await writer.drain()
+    writer.close()
+
+
+class SharedBodyTest(unittest.TestCase):
+    def test_extract_header_keeps_its_own_url(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+
+            async def run():
+                server = await asyncio.start_server(serve, "127.0.0.1", 0)
+                base = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+                urls = [f"{base}/a/1000", f"{base}/r/1050"]
+                cache = articles.ArticleCache(tmp / "cache")
+                try:
+                    async with Pool(timeout=5) as pool:
+                        cold = [await articles.fetch_article(pool, cache, u, 5) for u in urls]
+                        warm = [await articles.fetch_article(pool, cache, u, 5) for u in urls]
+                finally:
+                    server.close()
+                    await server.wait_closed()
+                return base, cache, cold, warm
+
+            with redirect_stderr(StringIO()):
+                base, cache, cold, warm = asyncio.run(run())
+            self.assertEqual(cache.stats["fetched"], 1)
+            self.assertEqual(cache.stats["reused"], 1)
+            self.assertEqual(cache.stats["fresh"], 2)
+            for docs in (cold, warm):
+                self.assertEqual([d["url"] for d in docs], [f"{base}/a/1000", f"{base}/a/1050"])
+                articles.write_extract(tmp / "1050.txt", docs[1], f"{base}/r/1050")
+                head = (tmp / "1050.txt").read_text(encoding="utf-8").splitlines()[:2]
+                self.assertEqual(head, ["Title: Before you continue", f"URL: {base}/a/1050"])
+            stored = cache.load_object(cache.index[f"{base}/a/1000"]["hash"])
+            self.assertNotIn("url", stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
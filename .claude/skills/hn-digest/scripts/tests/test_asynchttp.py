@@ -0,0 +1,172 @@
+"""
+asynchttp against a local asyncio server: broken response bodies, and
+when a POST may (not) be sent twice.
+
+    python3 -m unittest discover -s .claude/skills/hn-digest/scripts/tests
+"""
+
+import asyncio
+import gzip
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from asynchttp import HTTPError, Pool  # noqa: E402
+
+TEXT = b"<html><body>" + b"hello world " * 200 + b"</body></html>"
+GOOD = gzip.compress(TEXT)
+BODIES = {
+    "/good": GOOD,
+    "/truncated": GOOD[: len(GOOD) // 2],
+    "/corrupt": GOOD[:10] + bytes(b ^ 0x5A for b in GOOD[10:]),
+    "/garbage": b"this is not gzip at all",
+}
+
+
+async def serve(reader, writer):
+    request = await reader.readline()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass
+    body = BODIES[request.split()[1].decode()]
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nConnection: close\r\n"
+                 b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    await writer.drain()
+    writer.close()
+
+
+class CorruptBodyTest(unittest.TestCase):
+    def fetch(self, path: str):
+        async def run():
+            server = await asyncio.start_server(serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                async with Pool(timeout=5, retries=2, backoff=0.01) as pool:
+                    resp = await pool.get(f"http://127.0.0.1:{port}{path}")
+                    return resp, pool.stats
+            finally:
+                server.close()
+                await server.wait_closed()
+        return asyncio.run(run())
+
+    def test_good_gzip(self):
+        resp, _ = self.fetch("/good")
+        self.assertEqual(resp.body, TEXT)
+
+    def test_bad_gzip_raises_httperror_without_retry(self):
+        for path in ("/truncated", "/corrupt", "/garbage"):
+            with self.subTest(path=path):
+                with self.assertRaises(HTTPError) as cm:
+                    self.fetch(path)
+                self.assertIn("corrupt gzip body", str(cm.exception))
+                self.assertEqual(cm.exception.status, 200)
+
+
+class PostServer:
+    """Counts requests per path; each path misbehaves in its own way."""
+
+    def __init__(self):
+        self.hits = {}
+        self.handlers = set()
+
+    async def serve(self, reader, writer):
+        self.handlers.add(asyncio.current_task())
+        try:
+            await self._serve(reader, writer)
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _serve(self, reader, writer):
+        while True:
+            request = await reader.readline()
+            if not request:
+                break
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            path = request.split()[1].decode()
+            self.hits[path] = self.hits.get(path, 0) + 1
+            if path == "/slow":
+                await asyncio.sleep(0.5)
+            elif path == "/drop" and self.hits[path] > 1:
+                # the idle keep-alive socket dies with the request already read
+                break
+            status, extra = {"/busy": (503, b""), "/later": (503, b"Retry-After: 0\r\n"),
+                             "/limited": (429, b"")}.get(path, (200, b""))
+            if status != 200 and self.hits[path] > 1:
+                status, extra = 200, b""
+            writer.write(b"HTTP/1.1 %d X\r\n%sContent-Length: 2\r\n\r\nok" % (status, extra))
+            await writer.drain()
+
+    def run(self, *calls):
+        """Results of pool.request(method, path, **kw) for each call, in one pool."""
+        async def run():
+            server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            results = []
+            try:
+                async with Pool(timeout=0.3, retries=2, backoff=0.01) as pool:
+                    for method, path, kw in calls:
+                        try:
+                            results.append(await pool.request(method, f"http://127.0.0.1:{port}{path}",
+                                                              body=b"{}", **kw))
+                        except HTTPError as e:
+                            results.append(e)
+            finally:
+                await asyncio.gather(*self.handlers)
+                server.close()
+                await server.wait_closed()
+            return results
+        return asyncio.run(run())
+
+
+class PostRetryTest(unittest.TestCase):
+    def test_post_timeout_is_not_resent(self):
+        srv = PostServer()
+        [err] = srv.run(("POST", "/slow", {}))
+        self.assertIsInstance(err, HTTPError)
+        self.assertTrue(err.maybe_sent)
+        self.assertEqual(srv.hits["/slow"], 1)
+
+    def test_get_timeout_is_retried(self):
+        srv = PostServer()
+        [err] = srv.run(("GET", "/slow", {}))
+        self.assertFalse(err.maybe_sent)
+        self.assertEqual(srv.hits["/slow"], 3)
+
+    def test_timeout_on_reused_connection_is_not_a_stale_socket(self):
+        srv = PostServer()
+        ok, err = srv.run(("GET", "/ok", {}), ("GET", "/slow", {"retries": 0}))
+        self.assertEqual(ok.status, 200)
+        self.assertIsInstance(err, HTTPError)
+        self.assertIn("TimeoutError", str(err))
+        self.assertEqual(srv.hits["/slow"], 1)
+
+    def test_post_on_dead_idle_connection_is_not_resent(self):
+        srv = PostServer()
+        first, second = srv.run(("POST", "/drop", {}), ("POST", "/drop", {}))
+        self.assertEqual(first.status, 200)
+        self.assertIsInstance(second, HTTPError)
+        self.assertTrue(second.maybe_sent)
+        self.assertEqual(srv.hits["/drop"], 2)
+
+    def test_post_status_retries_need_explicit_guidance(self):
+        srv = PostServer()
+        busy, later, limited = srv.run(("POST", "/busy", {}), ("POST", "/later", {}), ("POST", "/limited", {}))
+        self.assertEqual((busy.status, srv.hits["/busy"]), (503, 1))
+        self.assertEqual((later.status, srv.hits["/later"]), (200, 2))
+        self.assertEqual((limited.status, srv.hits["/limited"]), (200, 2))
+
+    def test_post_idempotent_override(self):
+        srv = PostServer()
+        [resp] = srv.run(("POST", "/busy", {"idempotent": True}))
+        self.assertEqual((resp.status, srv.hits["/busy"]), (200, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+hn-fetch end to end against a local HN API and article server: one bad
+article must not cost the run its stories.md.
+
+    python3 -m unittest discover -s .claude/skills/hn-digest/scripts/tests
+"""
+
+import gzip
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import articles  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("hn_fetch", SCRIPTS / "hn-fetch.py")
+hn_fetch = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hn_fetch)
+
+PAGE = b"<html><head><title>Fine</title></head><body><p>" + b"words that extract " * 50 + b"</p></body></html>"
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send(self, body: bytes, ctype: str = "text/html", headers: dict = None):
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        if self.path == "/v0/topstories.json":
+            return self.send(b"[1, 2, 3]", "application/json")
+        if self.path.startswith("/v0/item/"):
+            sid = int(self.path.rsplit("/", 1)[1].split(".")[0])
+            item = {"id": sid, "type": "story", "title": f"Story {sid}", "by": "pg", "score": 10 * sid,
+                    "descendants": 0, "url": f"{base}/article/{sid}"}
+            return self.send(json.dumps(item).encode(), "application/json")
+        if self.path == "/article/2":
+            # corrupt gzip: fails inside the HTTP client
+            return self.send(gzip.compress(PAGE)[:40], headers={"Content-Encoding": "gzip"})
+        return self.send(PAGE)
+
+
+class OneBadArticleTest(unittest.TestCase):
+    def test_stories_written_when_articles_fail(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        port = server.server_port
+        bad = f"http://127.0.0.1:{port}/article/3"
+        record = articles.ArticleCache.record
+
+        def broken_record(cache, url, *args):
+            # a failure the client knows nothing about (parser, cache, decode...)
+            if url == bad:
+                raise RuntimeError("boom")
+            return record(cache, url, *args)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "digests").mkdir()
+            argv = ["hn-fetch.py", "-n", "3", "-o", str(tmp / "out"), "--api", f"http://127.0.0.1:{port}/v0",
+                    "--digests", str(tmp / "digests"), "--corpus-cache", str(tmp / "corpus"),
+                    "--article-cache", str(tmp / "articles"), "--retries", "0"]
+            err = StringIO()
+            with mock.patch.object(sys, "argv", argv), \
+                    mock.patch.object(articles.ArticleCache, "record", broken_record), \
+                    redirect_stdout(StringIO()), redirect_stderr(err):
+                hn_fetch.main()
+
+            stories = json.loads((tmp / "out" / "stories.json").read_text(encoding="utf-8"))["stories"]
+            self.assertEqual([s["id"] for s in stories], [1, 2, 3])
+            self.assertTrue((tmp / "out" / "stories.md").exists())
+            self.assertTrue(stories[0]["article_file"])
+            self.assertEqual(stories[1]["article_file"], "")
+            self.assertEqual(stories[2]["article_file"], "")
+            self.assertIn("corrupt gzip body", err.getvalue())
+            self.assertIn("RuntimeError: boom", err.getvalue())
+
+
+class StripTagsTest(unittest.TestCase):
+    def test_entities_are_decoded_after_tags(self):
+        text = 'It&#x27;s &quot;fine&quot;<p>a &lt;b&gt; &amp; <a href="x">c</a>'
+        self.assertEqual(hn_fetch.strip_tags(text), 'It\'s "fine"a <b> & c')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+notify.py against local stub Telegram and Discord endpoints: rate limits,
+the send journal, unknown outcomes, and what the messages look like.
+
+    python3 -m unittest discover -s .claude/skills/hn-digest/scripts/tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import notify  # noqa: E402
+
+DIGEST = {
+    "date": "2026-02-01T06:00:00Z",
+    "vibe": "Robots & <tags>",
+    "stories": [
+        {"id": 101, "title": "Rust <3 & \"C\"", "tldr": "a < b", "take": "x & y", "comments_count": 5,
+         "hn_url": "https://news.ycombinator.com/item?id=101"},
+        {"id": 102, "title": "[Show HN] brackets", "tldr": "plain", "take": "hot", "comments_count": 50},
+    ],
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        stub = self.server.stub
+        with stub.lock:
+            stub.posts.append((self.path, body))
+            status, payload, delay = stub.script.pop(0) if stub.script else (200, {"ok": True}, 0)
+        if delay:
+            time.sleep(delay)
+        data = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass    # the client gave up waiting
+
+
+class Stub:
+    """Records every POST; `script` holds (status, body, delay) for the next ones, then 200s."""
+
+    def __init__(self, test: unittest.TestCase):
+        self.posts, self.script, self.lock = [], [], threading.Lock()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.stub = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        test.addCleanup(server.server_close)
+        test.addCleanup(server.shutdown)
+        self.base = f"http://127.0.0.1:{server.server_port}"
+
+
+class NotifyTest(unittest.TestCase):
+    def setUp(self):
+        self.stub = Stub(self)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.digest = self.tmp / "digest.json"
+        self.digest.write_text(json.dumps(DIGEST), encoding="utf-8")
+        self.journal = self.tmp / "notify.json"
+
+    def notify(self, *flags, discord: bool = False):
+        env = {"TG_BOT_TOKEN": "token", "TG_CHANNEL_ID": "@chan"}
+        if discord:
+            env["DISCORD_WEBHOOK_URL"] = f"{self.stub.base}/discord"
+        argv = ["notify.py", str(self.digest), "--journal", str(self.journal),
+                "--telegram-api", self.stub.base, "--telegram-interval", "0", "--retries", "0", *flags]
+        out, err = StringIO(), StringIO()
+        with mock.patch.object(sys, "argv", argv), mock.patch.dict(os.environ, env, clear=True), \
+                redirect_stdout(out), redirect_stderr(err):
+            try:
+                notify.main()
+            except SystemExit as e:
+                self.assertEqual(e.code, 0, err.getvalue())
+        return out.getvalue(), err.getvalue()
+
+    def statuses(self) -> dict:
+        data = json.loads(self.journal.read_text(encoding="utf-8"))
+        return {k: v["status"] for k, v in data["digests"][DIGEST["date"]].items()}
+
+    def test_rate_limit_is_waited_out(self):
+        self.stub.script = [(429, {"ok": False, "parameters": {"retry_after": 0.3}}, 0)]
+        t = time.monotonic()
+        out, err = self.notify()
+        self.assertGreaterEqual(time.monotonic() - t, 0.3)
+        self.assertIn("rate limited, waiting 0.3s", err)
+        self.assertEqual([p for p, _ in self.stub.posts], ["/bottoken/sendMessage"] * 3)
+        self.assertEqual(self.statuses(), {"telegram:101": "sent", "telegram:102": "sent"})
+
+    def test_rerun_with_journal_sends_nothing(self):
+        self.notify(discord=True)
+        self.assertEqual(len(self.stub.posts), 3)
+        out, _ = self.notify(discord=True)
+        self.assertEqual(len(self.stub.posts), 3)
+        self.assertIn("telegram: 0 sent, 2 already sent", out)
+        self.assertIn("discord: 0 sent, 1 already sent", out)
+
+    def test_timeout_after_send_is_unknown_and_not_resent(self):
+        self.stub.script = [(200, {"ok": True}, 2)]
+        out, err = self.notify("--timeout", "0.5")
+        self.assertEqual(len(self.stub.posts), 2)
+        self.assertIn("outcome unknown, not resending", err)
+        self.assertIn("telegram: 1 sent, 0 already sent, 1 unknown, 0 failed", out)
+        self.assertEqual(self.statuses(), {"telegram:101": "unknown", "telegram:102": "sent"})
+
+        out, err = self.notify()
+        self.assertEqual(len(self.stub.posts), 2)
+        self.assertIn("telegram: 0 sent, 1 already sent, 1 unknown, 0 failed", out)
+        self.notify("--resend-unknown")
+        self.assertEqual(len(self.stub.posts), 3)
+        self.assertEqual(self.statuses()["telegram:101"], "sent")
+
+    def test_messages_escape_and_link(self):
+        self.notify(discord=True)
+        discord = [body for path, body in self.stub.posts if path == "/discord"]
+        telegram = [body for path, body in self.stub.posts if path != "/discord"]
+        anchor = f"{notify.BASE_URL}#s101-02010600"
+
+        first = telegram[0]
+        self.assertEqual(first["chat_id"], "@chan")
+        self.assertEqual(first["parse_mode"], "HTML")
+        self.assertTrue(first["text"].startswith('<b>Rust &lt;3 &amp; "C"</b>\n\na &lt; b\n\n<i>Take: x &amp; y</i>'))
+        self.assertIn(f'<a href="{anchor}">Read →</a>', first["text"])
+        self.assertIn('<a href="https://news.ycombinator.com/item?id=101">HN</a>', first["text"])
+        self.assertIn('href="https://news.ycombinator.com/item?id=102"', telegram[1]["text"])
+
+        embed = discord[0]["embeds"][0]
+        self.assertEqual(embed["title"], "📰 Robots & <tags>")
+        self.assertEqual(embed["description"].splitlines(), [
+            f"• [Rust <3 & \"C\"]({anchor}) - a < b",
+            f"• [\\[Show HN\\] brackets]({notify.BASE_URL}#s102-02010600) - plain",
+        ])
+
+    def test_discord_anchor_parenthesis_is_encoded(self):
+        embed = notify.discord_embed(DIGEST, "https://example.com/a)b")["embeds"][0]
+        self.assertIn("(https://example.com/a%29b#s101-02010600)", embed["description"])
+
+
+if __name__ == "__main__":
+    unittest.main()
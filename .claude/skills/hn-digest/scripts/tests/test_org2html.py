@@ -0,0 +1,58 @@
+"""
+org2html rebuilding translation shards when both i18n/ and the cached
+translations are gone.
+
+    python3 -m unittest discover -s .claude/skills/hn-digest/scripts/tests
+"""
+
+import importlib.util
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS))
+
+import synthetic  # noqa: E402
+
+spec = importlib.util.spec_from_file_location("org2html", SCRIPTS / "org2html.py")
+org2html = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(org2html)
+
+
+class MissingShardsTest(unittest.TestCase):
+    def test_shards_rebuilt_without_cached_translations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            synthetic.write_archive(tmp / "digests", 3, seed=1)
+            argv = ["org2html.py", str(tmp / "digests/*/*/*.org"), "-o", str(tmp / "index.html"),
+                    "--cache-dir", str(tmp / "cache"), "--corpus-cache", str(tmp / "corpus")]
+
+            def build(*flags) -> str:
+                out = StringIO()
+                with mock.patch.object(sys, "argv", argv + list(flags)), redirect_stdout(out):
+                    org2html.main()
+                return out.getvalue()
+
+            build()
+            shards = {p.relative_to(tmp).as_posix(): p.read_bytes() for p in tmp.glob("i18n/*/*.json")}
+            self.assertTrue(shards)
+
+            shutil.rmtree(tmp / "i18n")
+            for cached in (tmp / "cache").glob("??/*.i18n.json"):
+                cached.unlink()
+            out = build("--check")
+            self.assertIn("check: incremental output identical to full rebuild", out)
+            self.assertIn("3 digests: 3 rendered, 0 cached", out)
+            self.assertEqual({p.relative_to(tmp).as_posix(): p.read_bytes() for p in tmp.glob("i18n/*/*.json")},
+                             shards)
+            self.assertIn("3 digests: 0 rendered, 3 cached", build())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Per-run stage timings: one wall-clock span per pipeline stage in timings.json.
+
+The workflow points HN_TIMINGS at a file for the whole job. Python scripts
+record their own span:
+
+    with timings.span("org2html") as stage:
+        ...
+        stage["detail"] = "3 rendered, 282 cached"
+
+Stages that are not one of our scripts (the curator) are timed by the
+workflow itself, with begin and end in the steps around them. There is
+deliberately no "time this command" wrapper: the curator may run our
+scripts, and a wrapper on its allowlist would let any command through.
+Without HN_TIMINGS set, nothing is recorded, so local runs leave no files
+behind.
+
+timings.json:
+    {"commit": "...", "run": "...", "stages": [
+        {"stage": "fetch", "start": "2026-02-01T01:00:03.120Z", "seconds": 12.41, "ok": true, ...}]}
+
+compare() is the regression check shared with bench.py: a stage fails when
+it got more than `threshold` percent slower and at least `min_delta`
+seconds slower, so sub-second jitter doesn't trip it.
+
+Usage:
+    ./timings.py begin curate                # open a span in one workflow step
+    ./timings.py end curate                  # close it in a later one
+    ./timings.py show                        # print the current file
+    ./timings.py compare old.json new.json --threshold 25
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+ENV = "HN_TIMINGS"
+THRESHOLD = 25.0
+MIN_DELTA = 0.05
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _seconds_between(start: str, end: str) -> float:
+    parse = lambda s: datetime.strptime(s, "%Y-%m-%dT%H:%M:%S.%fZ")  # noqa: E731
+    return round((parse(end) - parse(start)).total_seconds(), 3)
+
+
+def path() -> Path | None:
+    value = os.environ.get(ENV)
+    return Path(value) if value else None
+
+
+def load(file: Path) -> dict:
+    try:
+        return json.loads(file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"commit": os.environ.get("GITHUB_SHA", ""), "run": os.environ.get("GITHUB_RUN_ID", ""),
+                "stages": []}
+
+
+def _save(file: Path, data: dict):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    tmp.replace(file)
+
+
+def record(stage: dict):
+    """Append one finished stage to the run's timings file, if there is one."""
+    file = path()
+    if file is None:
+        return
+    data = load(file)
+    data["stages"].append(stage)
+    _save(file, data)
+
+
+@contextmanager
+def span(name: str):
+    """Time the block as stage `name`; the yielded dict can carry extra fields."""
+    stage = {"stage": name, "start": _now()}
+    t = perf_counter()
+    try:
+        yield stage
+    except BaseException as e:
+        stage["ok"] = isinstance(e, SystemExit) and not e.code
+        raise
+    else:
+        stage.setdefault("ok", True)
+    finally:
+        stage["seconds"] = round(perf_counter() - t, 3)
+        record(stage)
+
+
+def begin(name: str):
+    record({"stage": name, "start": _now()})
+
+
+def end(name: str, ok: bool = True) -> bool:
+    """Close the newest open span called `name`; False if there was none."""
+    file = path()
+    if file is None:
+        return True
+    data = load(file)
+    for stage in reversed(data["stages"]):
+        if stage["stage"] == name and "seconds" not in stage:
+            stage["seconds"] = _seconds_between(stage["start"], _now())
+            stage["ok"] = ok
+            _save(file, data)
+            return True
+    return False
+
+
+def totals(data: dict) -> dict:
+    """stage -> seconds, summed over repeats, from timings.json or bench.py results."""
+    if "results" in data:
+        return {name: r["seconds"] for name, r in data["results"].items()}
+    out = {}
+    for stage in data.get("stages", []):
+        if "seconds" in stage:
+            out[stage["stage"]] = round(out.get(stage["stage"], 0) + stage["seconds"], 3)
+    return out
+
+
+def compare(base: dict, new: dict, threshold: float = THRESHOLD, min_delta: float = MIN_DELTA) -> list:
+    """[(stage, before, after, percent)] for every stage slower than allowed.
+
+    Stages only one side has are skipped: nothing to compare against.
+    """
+    before, after = totals(base), totals(new)
+    slower = []
+    for name in sorted(before.keys() & after.keys()):
+        old, cur = before[name], after[name]
+        if cur - old >= min_delta and cur > old * (1 + threshold / 100):
+            slower.append((name, old, cur, (cur / old - 1) * 100 if old else float("inf")))
+    return slower
+
+
+def report(base: dict, new: dict, threshold: float, min_delta: float) -> bool:
+    """Print the before/after table; True if nothing regressed."""
+    before, after = totals(base), totals(new)
+    slower = {s[0] for s in compare(base, new, threshold, min_delta)}
+    for name in sorted(before.keys() | after.keys()):
+        old, cur = before.get(name), after.get(name)
+        change = f"{(cur / old - 1) * 100:+7.1f}%" if old and cur is not None else "       "
+        print(f"{name:<32} {old if old is not None else '-':>9} {cur if cur is not None else '-':>9} "
+              f"{change}{'  REGRESSION' if name in slower else ''}")
+    if slower:
+        print(f"{len(slower)} stage(s) more than {threshold:g}% (and {min_delta:g}s) slower", file=sys.stderr)
+    return not slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and compare per-stage pipeline timings")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("begin", help="open a span").add_argument("stage")
+    close = sub.add_parser("end", help="close the newest open span of that name")
+    close.add_argument("stage")
+    close.add_argument("--failed", action="store_true", help="mark the stage as failed")
+    show = sub.add_parser("show", help="print a timings file")
+    show.add_argument("file", type=Path, nargs="?", help=f"default: ${ENV}")
+    cmp = sub.add_parser("compare", help="fail if any stage got slower than the threshold")
+    cmp.add_argument("base", type=Path)
+    cmp.add_argument("new", type=Path)
+    cmp.add_argument("--threshold", type=float, default=THRESHOLD,
+                     help=f"allowed slowdown in percent (default: {THRESHOLD:g})")
+    cmp.add_argument("--min-delta", type=float, default=MIN_DELTA,
+                     help=f"ignore slowdowns smaller than this many seconds (default: {MIN_DELTA:g})")
+    args = parser.parse_args()
+
+    if args.cmd == "begin":
+        begin(args.stage)
+    elif args.cmd == "end":
+        if not end(args.stage, ok=not args.failed):
+            print(f"warn: no open span {args.stage!r}", file=sys.stderr)
+    elif args.cmd == "show":
+        file = args.file or path()
+        if file is None:
+            parser.error(f"show: give a file or set ${ENV}")
+        data = load(file)
+        for stage in data["stages"]:
+            took = f"{stage['seconds']:8.2f}s" if "seconds" in stage else "    open "
+            flag = "" if stage.get("ok", True) else "  FAILED"
+            print(f"{stage['start'][11:23]}  {stage['stage']:<14} {took}  {stage.get('detail', '')}{flag}".rstrip())
+    else:
+        for file in (args.base, args.new):
+            if not file.exists():
+                parser.error(f"compare: no such file: {file}")
+        ok = report(load(args.base), load(args.new), args.threshold, args.min_delta)
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
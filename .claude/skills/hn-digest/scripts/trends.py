@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Tag and story trend rollups for the digest archive.
+
+Every story appearance counts once for each of its tags, on the day of its
+digest; weeks (ISO) and months are sums of days. Tags on the same story
+co-occur. A story covered by more than one digest gets a trajectory: its
+points and comments at each appearance.
+
+Layout (trends/ next to index.html):
+    meta.json             totals, file lists, top tags all time and lately
+    tags/YYYY-MM.json     {"month": {tag: n}, "days": {"YYYY-MM-DD": {tag: n}}}
+    weeks/YYYY.json       {"YYYY-Www": {tag: n}} for one ISO year
+    cooccur.json          {tag: [[other, n], ...]} for the COOCCUR_TAGS most used tags
+    stories/N.json        {id: [title, [[when, points, comments], ...]]} for ids // STORY_BUCKET == N
+
+The counts are kept in .cache/trends/ together with each digest's own
+contribution and content hash (see Rollup). A run subtracts the
+contribution of every changed or deleted digest, adds the new ones, and
+rewrites only the month, year and story-bucket files they touch (plus
+meta.json and cooccur.json). State is sharded the same way, down to the
+digest hashes and tag pairs, so adding a digest writes about the same
+amount with 300 or 30000 in the archive. --check recomputes everything
+from the digests and compares it with what is on disk.
+
+Usage:
+    ./trends.py               # update trends/ from digests/
+    ./trends.py --rebuild     # ignore the saved state, recompute everything
+    ./trends.py --check       # incremental output == full recompute?
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+import zlib
+from datetime import date, timedelta
+from itertools import permutations
+from pathlib import Path
+from time import perf_counter
+
+import orgcorpus
+import timings
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent.parent.parent
+OUT_DIR = REPO_ROOT / "trends"
+CACHE_DIR = REPO_ROOT / ".cache" / "trends"
+
+# bump when the state layout or contribution() changes
+STATE_VERSION = 2
+# bump when the layout of the trends/ files changes
+FORMAT_VERSION = 1
+
+TOP_TAGS = 50
+RECENT_DAYS = 30
+COOCCUR_TAGS = 200
+COOCCUR_TOP = 10
+STORY_BUCKET = 100_000
+PAIR_SHARDS = 64
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def contribution(digest: orgcorpus.Digest) -> dict:
+    """What one digest adds to the rollups: its date and [id, title, points, comments, tags]."""
+    stories = []
+    for s in digest.stories:
+        tags = list(dict.fromkeys(t.lower().lstrip("#") for t in s.tags if t.strip("#")))
+        stories.append([s.id, s.title, _int(s.props.get("POINTS")), _int(s.props.get("COMMENTS")), tags])
+    return {"date": digest.date, "stories": stories}
+
+
+def iso_week(day: str) -> tuple:
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return year, f"{year}-W{week:02d}"
+
+
+def bucket(sid: str) -> int:
+    return int(sid) // STORY_BUCKET
+
+
+def pair_shard(tag: str) -> str:
+    return f"{zlib.crc32(tag.encode()) % PAIR_SHARDS:02d}"
+
+
+def group(key: str) -> str:
+    """Digests are diffed against the state one directory (one month) at a time."""
+    return key.rpartition("/")[0]
+
+
+def group_hash(entries: list) -> str:
+    return hashlib.sha1("".join(f"{k} {sha1}\n" for k, sha1 in sorted(entries)).encode()).hexdigest()
+
+
+def _bump(counts: dict, key, n: int):
+    value = counts.get(key, 0) + n
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _add(total: dict, counts: dict):
+    for tag, n in counts.items():
+        total[tag] = total.get(tag, 0) + n
+
+
+def _top(counts: dict, n: int) -> list:
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class Shards:
+    """One kind of state file (dir/NAME.json), each read on first use and saved if touched."""
+
+    def __init__(self, root: Path, enabled: bool = True):
+        self.root = root
+        self.enabled = enabled
+        self.data = {}
+        self.touched = set()
+
+    def get(self, name: str, touch: bool = False) -> dict:
+        if name not in self.data:
+            data = {}
+            if self.enabled:
+                try:
+                    data = json.loads((self.root / f"{name}.json").read_bytes())
+                except (OSError, ValueError):
+                    pass
+            self.data[name] = data
+        if touch:
+            self.touched.add(name)
+        return self.data[name]
+
+    def save(self):
+        for name in self.touched:
+            path = self.root / f"{name}.json"
+            if self.data[name]:
+                _write(path, _dumps(self.data[name]))
+            elif path.exists():
+                path.unlink()
+        self.touched.clear()
+
+
+class Rollup:
+    """Trend counts plus the per-digest contributions they were summed from.
+
+    State (.cache/trends/):
+        index.json         digest dir -> [keys shard, hash of its (key, sha1) list, digests],
+                           tag totals, month -> [first day, last day], revisited-story
+                           count per bucket
+        keys/NAME.json     {key: [sha1, month]} for the digests in one dir
+        days/YYYY-MM.json  {day: {tag: n}}
+        digests/YYYY-MM.json  {key: contribution} for digests dated in that month
+        pairs/NN.json      {tag: {other: n}} for tags with crc32 % PAIR_SHARDS == NN
+        stories/N.json     {id: {key: [when, points, comments, title]}}
+
+    Only the shards an update touches are read or written; index.json grows
+    with the number of months and tags, not digests.
+    """
+
+    KINDS = ("keys", "days", "digests", "pairs", "stories")
+
+    def __init__(self, root: Path = CACHE_DIR, enabled: bool = True):
+        self.root = root
+        self.index = {"groups": {}, "totals": {}, "months": {}, "buckets": {}, "appearances": 0}
+        self.fresh = True
+        if enabled:
+            try:
+                index = json.loads((root / "index.json").read_text(encoding="utf-8"))
+                if index.get("version") == STATE_VERSION:
+                    del index["version"]
+                    self.index, self.fresh = index, False
+            except (OSError, ValueError):
+                pass
+        enabled = not self.fresh
+        self.keys = Shards(root / "keys", enabled)
+        self.days = Shards(root / "days", enabled)
+        self.contribs = Shards(root / "digests", enabled)
+        self.pairs = Shards(root / "pairs", enabled)
+        self.stories = Shards(root / "stories", enabled)
+        self.added = self.removed = 0
+        self.dirty = set()    # output files to rewrite
+        self.changed = False
+
+    @property
+    def totals(self) -> dict:
+        return self.index["totals"]
+
+    def update(self, entries: list, load) -> bool:
+        """Bring the counts up to date for [(key, sha1)]; `load(key)` returns that Digest."""
+        groups = self.index["groups"]
+        live = {}
+        for key, sha1 in entries:
+            live.setdefault(group(key), []).append((key, sha1))
+        # only dirs whose (key, sha1) list changed are opened
+        changed = []
+        for name in sorted(set(live) | set(groups)):
+            h = group_hash(live.get(name, []))
+            if name not in groups or groups[name][1] != h:
+                changed.append((name, h))
+        for name, _ in changed:
+            if name not in groups:
+                continue
+            digests, now = self.keys.get(groups[name][0], touch=True), dict(live.get(name, []))
+            for key in [k for k, (sha1, _) in digests.items() if now.get(k) != sha1]:
+                _, month = digests.pop(key)
+                if month:
+                    self._apply(key, self.contribs.get(month, touch=True).pop(key), -1)
+                self.removed += 1
+        for name, h in changed:
+            shard = groups[name][0] if name in groups else hashlib.sha1(name.encode()).hexdigest()[:16]
+            digests = self.keys.get(shard, touch=True)
+            for key, sha1 in live.get(name, []):
+                if key not in digests:
+                    contrib = contribution(load(key))
+                    month = contrib["date"][:7] if len(contrib["date"]) >= 16 else ""
+                    digests[key] = [sha1, month]
+                    if month:
+                        self.contribs.get(month, touch=True)[key] = contrib
+                        self._apply(key, contrib, 1)
+                    self.added += 1
+            if digests:
+                groups[name] = [shard, h, len(digests)]
+            else:
+                groups.pop(name, None)
+        self.changed = bool(self.added or self.removed)
+        return self.changed
+
+    def _apply(self, key: str, contrib: dict, sign: int):
+        index = self.index
+        d = contrib["date"]
+        day, when = d[:10], f"{d[:10]} {d[11:16]}"
+        days = self.days.get(day[:7], touch=True)
+        counts = days.setdefault(day, {})
+        self.dirty.update((f"tags/{day[:7]}.json", f"weeks/{iso_week(day)[0]}.json", "cooccur.json"))
+        index["appearances"] += sign * len(contrib["stories"])
+        for sid, title, points, comments, tags in contrib["stories"]:
+            for tag in tags:
+                _bump(counts, tag, sign)
+                _bump(index["totals"], tag, sign)
+            for a, b in permutations(tags, 2):
+                pairs = self.pairs.get(pair_shard(a), touch=True)
+                partners = pairs.setdefault(a, {})
+                _bump(partners, b, sign)
+                if not partners:
+                    del pairs[a]
+            if not sid.isdigit():
+                continue
+            b = str(bucket(sid))
+            shard = self.stories.get(b, touch=True)
+            apps = shard.setdefault(sid, {})
+            revisited = len(apps) > 1
+            if sign > 0:
+                apps[key] = [when, points, comments, title]
+            else:
+                apps.pop(key, None)
+                if not apps:
+                    del shard[sid]
+            _bump(index["buckets"], b, (len(apps) > 1) - revisited)
+            self.dirty.add(f"stories/{b}.json")
+        if not counts:
+            del days[day]
+        if days:
+            index["months"][day[:7]] = [min(days), max(days)]
+        else:
+            index["months"].pop(day[:7], None)
+
+    def save(self):
+        if not self.changed:
+            return
+        if self.fresh:
+            # a new state must not pick up shards of the one it replaces
+            for kind in self.KINDS:
+                shutil.rmtree(self.root / kind, ignore_errors=True)
+        for shards in (self.keys, self.days, self.contribs, self.pairs, self.stories):
+            shards.save()
+        _write(self.root / "index.json", _dumps({"version": STATE_VERSION, **self.index}))
+        self.changed = self.fresh = False
+
+    # -- output files
+
+    def months(self) -> list:
+        return sorted(self.index["months"])
+
+    def years(self) -> list:
+        # a month spans at most two ISO years, and its first and last day say which
+        return sorted({iso_week(day)[0] for span in self.index["months"].values() for day in span})
+
+    def buckets(self) -> list:
+        """Story buckets holding at least one story covered more than once."""
+        return sorted(self.index["buckets"], key=int)
+
+    def files(self) -> list:
+        return (["meta.json", "cooccur.json"] + [f"tags/{m}.json" for m in self.months()]
+                + [f"weeks/{y}.json" for y in self.years()]
+                + [f"stories/{b}.json" for b in self.buckets()])
+
+    def day(self, day: str) -> dict:
+        first, last = self.index["months"].get(day[:7], ("", ""))
+        return self.days.get(day[:7]).get(day, {}) if first <= day <= last else {}
+
+    def render(self, name: str):
+        """JSON for one output file, or None when it should not exist."""
+        kind, _, stem = name.partition("/")
+        stem = stem.removesuffix(".json")
+        if kind == "meta.json":
+            return self._meta()
+        if kind == "cooccur.json":
+            return {tag: _top(self.pairs.get(pair_shard(tag)).get(tag, {}), COOCCUR_TOP)
+                    for tag, _ in _top(self.totals, COOCCUR_TAGS)}
+        if kind == "tags":
+            days = {d: counts for d, counts in self.days.get(stem).items() if counts}
+            month = {}
+            for counts in days.values():
+                _add(month, counts)
+            return {"month": month, "days": days} if days else None
+        if kind == "weeks":
+            year, weeks = int(stem), {}
+            day = date.fromisocalendar(year, 1, 1)
+            while day.isocalendar()[0] == year:
+                counts = self.day(day.isoformat())
+                if counts:
+                    _add(weeks.setdefault(iso_week(day.isoformat())[1], {}), counts)
+                day += timedelta(days=1)
+            return weeks or None
+        if kind == "stories":
+            out = {}
+            for sid, apps in self.stories.get(stem).items():
+                if len(apps) > 1:
+                    path = [apps[key] for key in sorted(apps, key=lambda k: (apps[k][0], k))]
+                    out[sid] = [path[-1][3], [a[:3] for a in path]]
+            return out or None
+        raise ValueError(f"unknown trends file: {name}")
+
+    def _meta(self) -> dict:
+        months = self.index["months"]
+        first = months[min(months)][0] if months else None
+        last = months[max(months)][1] if months else None
+        recent = {}
+        if last:
+            for n in range(RECENT_DAYS):
+                _add(recent, self.day((date.fromisoformat(last) - timedelta(days=n)).isoformat()))
+        return {
+            "version": FORMAT_VERSION,
+            "digests": sum(n for _, _, n in self.index["groups"].values()),
+            "appearances": self.index["appearances"],
+            "tags": len(self.totals),
+            "first": first,
+            "last": last,
+            "months": self.months(),
+            "years": self.years(),
+            "story_bucket": STORY_BUCKET,
+            "story_buckets": [int(b) for b in self.buckets()],
+            "top": _top(self.totals, TOP_TAGS),
+            "recent_days": RECENT_DAYS,
+            "recent": _top(recent, TOP_TAGS),
+        }
+
+    def write(self, out: Path, rebuild: bool = False) -> tuple:
+        """Rewrite dirty (or missing) files, drop ones that should no longer exist.
+
+        Returns (written, removed).
+        """
+        wanted = set(self.files())
+        names = set(wanted) if rebuild else {"meta.json"} | self.dirty
+        names |= {n for n in wanted if not (out / n).exists()}
+        written = removed = 0
+        for name in sorted(names):
+            data = self.render(name) if name in wanted else None
+            path = out / name
+            if data is None:
+                if path.exists():
+                    path.unlink()
+                    removed += 1
+                continue
+            _write(path, _dumps(data))
+            written += 1
+        for path in out.glob("*/*.json"):
+            if path.relative_to(out).as_posix() not in wanted:
+                path.unlink()
+                removed += 1
+        self.dirty.clear()
+        return written, removed
+
+
+def on_disk(out: Path) -> dict:
+    return {p.relative_to(out).as_posix(): p.read_bytes()
+            for p in sorted(out.glob("**/*.json"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update tag and story trend rollups")
+    parser.add_argument("-o", "--out", type=Path, default=OUT_DIR, help="output dir (default: trends/)")
+    parser.add_argument("--digests", type=Path, default=orgcorpus.DIGESTS_DIR, help="digests dir")
+    parser.add_argument("--corpus-cache", type=Path, default=orgcorpus.CACHE_DIR, help="parsed digest cache dir")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="rollup state dir")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved state, recompute everything")
+    parser.add_argument("--check", action="store_true",
+                        help="verify incremental output is byte-identical to a full recompute")
+    args = parser.parse_args()
+
+    t = perf_counter()
+    corpus, keys = orgcorpus.load(orgcorpus.digest_files(args.digests), args.corpus_cache)
+    entries = [(k, corpus.sha1(k)) for k in sorted(set(keys))]
+    rollup = Rollup(args.cache_dir, enabled=not args.rebuild)
+    rollup.update(entries, corpus.digest)
+    written, removed = rollup.write(args.out, rebuild=args.rebuild)
+    rollup.save()
+    print(f"{args.out}/: {len(entries)} digests ({rollup.added} added, {rollup.removed} removed), "
+          f"{len(rollup.totals)} tags, {written} files written, {removed} removed "
+          f"({(perf_counter() - t) * 1000:.0f}ms)")
+
+    if args.check:
+        full = Rollup(enabled=False)
+        full.update(entries, corpus.digest)
+        expected = {name: _dumps(full.render(name)) for name in full.files()}
+        if on_disk(args.out) != expected:
+            print("error: incremental output differs from full recompute", file=sys.stderr)
+            sys.exit(1)
+        print("check: incremental output identical to full recompute")
+
+
+if __name__ == "__main__":
+    with timings.span("trends"):
+        main()